@@ -32,7 +32,9 @@
     'website': "https://www.cybrosys.com",
     'depends': ['base'],
     'data': [
+        'security/ir.model.access.csv',
         'views/res_users.xml',
+        'wizard/hide_menu_wizard.xml',
         'security/security.xml'
     ],
     'license': 'LGPL-3',
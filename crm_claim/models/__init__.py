@@ -4,3 +4,4 @@ from . import crm_claim
 from . import crm_claim_category
 from . import crm_claim_stage
 from . import res_partner
+from . import mail_message
@@ -0,0 +1,42 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl).
+
+from collections import Counter
+
+from odoo import api, models
+
+
+class MailMessage(models.Model):
+    _inherit = "mail.message"
+
+    def _get_claim_message_counts(self):
+        """Number of messages by claim id."""
+        return Counter(
+            message.res_id
+            for message in self.sudo()
+            if message.model == "crm.claim" and message.res_id
+        )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        messages = super().create(vals_list)
+        self.env["crm.claim.report"]._add_message_counts(
+            messages._get_claim_message_counts()
+        )
+        return messages
+
+    def write(self, vals):
+        if "model" not in vals and "res_id" not in vals:
+            return super().write(vals)
+        counts = Counter()
+        counts.subtract(self._get_claim_message_counts())
+        res = super().write(vals)
+        counts.update(self._get_claim_message_counts())
+        self.env["crm.claim.report"]._add_message_counts(counts)
+        return res
+
+    def unlink(self):
+        counts = Counter()
+        counts.subtract(self._get_claim_message_counts())
+        self.env["crm.claim.report"]._add_message_counts(counts)
+        return super().unlink()
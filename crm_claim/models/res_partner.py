@@ -13,12 +13,7 @@ class ResPartner(models.Model):
 
     @api.depends("claim_ids", "child_ids", "child_ids.claim_ids")
     def _compute_claim_count(self):
-        partners = self | self.mapped("child_ids")
-        partner_data = self.env["crm.claim"].read_group(
-            [("partner_id", "in", partners.ids)], ["partner_id"], ["partner_id"]
-        )
-        mapped_data = {m["partner_id"][0]: m["partner_id_count"] for m in partner_data}
+        """Count the claims of the whole hierarchy of each partner."""
+        claim_data = self._get_hierarchy_counts("crm.claim")
         for partner in self:
-            partner.claim_count = mapped_data.get(partner.id, 0)
-            for child in partner.child_ids:
-                partner.claim_count += mapped_data.get(child.id, 0)
+            partner.claim_count = claim_data.get(partner.id, 0)
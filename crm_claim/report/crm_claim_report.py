@@ -5,13 +5,14 @@
 
 from psycopg2.extensions import AsIs
 
-from odoo import fields, models, tools
+from odoo import api, fields, models, tools
 
 
 class CrmClaimReport(models.Model):
     """CRM Claim Report"""
 
     _name = "crm.claim.report"
+    _inherit = "crm.sql.report.mixin"
     _auto = False
     _description = "CRM Claim Report"
 
@@ -66,7 +67,7 @@ class CrmClaimReport(models.Model):
     def _select(self):
         select_str = """
             SELECT
-            min(c.id) AS id,
+            c.id AS id,
             c.date AS claim_date,
             c.date_closed AS date_closed,
             c.date_deadline AS date_deadline,
@@ -77,19 +78,15 @@ class CrmClaimReport(models.Model):
             c.company_id,
             c.categ_id,
             c.name AS subject,
-            count(*) AS nbr_claims,
+            1 AS nbr_claims,
             c.priority AS priority,
             c.type_action AS type_action,
             c.create_date AS create_date,
-            avg(extract(
+            extract(
                 'epoch' FROM (
-                    c.date_closed-c.create_date)))/(3600*24)
+                    c.date_closed-c.create_date))/(3600*24)
                     AS delay_close,
-            (
-                SELECT count(id)
-                FROM mail_message
-                WHERE model='crm.claim'
-                AND res_id=c.id) AS email,
+            coalesce(mc.message_count, 0) AS email,
             extract(
                 'epoch' FROM (
                     c.date_deadline - c.date_closed))/(3600*24)
@@ -100,22 +97,32 @@ class CrmClaimReport(models.Model):
     def _from(self):
         from_str = """
             crm_claim c
+            LEFT JOIN crm_claim_message_count mc ON mc.claim_id = c.id
         """
         return from_str
 
     def _group_by(self):
+        # one row per claim, read_group aggregates them by the dimensions
+        # chosen in the pivot and graph views
         group_by_str = """
-            GROUP BY c.date, c.user_id, c.team_id, c.stage_id, c.categ_id,
-                c.partner_id, c.company_id, c.create_date, c.priority,
-                c.type_action, c.date_deadline, c.date_closed, c.id
         """
         return group_by_str
 
     def init(self):
         """Display Number of cases And Team Name
         @param cr: the current row, from the database cursor,
+
+        The view is only created again when its SQL definition changes.
         """
+        self._init_message_count()
+        self._init_sql_relation(
+            self._table,
+            "VIEW",
+            (self._select(), self._from(), self._group_by()),
+            self._create_view,
+        )
 
+    def _create_view(self):
         tools.drop_view_if_exists(self.env.cr, self._table)
         self.env.cr.execute(
             """
@@ -132,3 +139,48 @@ class CrmClaimReport(models.Model):
                 AsIs(self._group_by()),
             ),
         )
+
+    def _init_message_count(self):
+        """Create the table holding the number of messages of each claim,
+        filled from the existing messages the first time."""
+        self.env.cr.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crm_claim_message_count (
+                claim_id integer PRIMARY KEY,
+                message_count integer NOT NULL
+            )
+            """
+        )
+        self.env.cr.execute("SELECT 1 FROM crm_claim_message_count LIMIT 1")
+        if self.env.cr.fetchone():
+            return
+        self.env["mail.message"].flush_model(["model", "res_id"])
+        self.env.cr.execute(
+            """
+            INSERT INTO crm_claim_message_count (claim_id, message_count)
+            SELECT res_id, count(*)
+            FROM mail_message
+            WHERE model = 'crm.claim' AND res_id IS NOT NULL
+            GROUP BY res_id
+            """
+        )
+
+    @api.model
+    def _add_message_counts(self, counts):
+        """Add ``counts``, the message count variations by claim id, to the
+        counts shown in the report."""
+        counts = {
+            claim_id: count for claim_id, count in counts.items() if claim_id and count
+        }
+        if not counts:
+            return
+        self.env.cr.execute(
+            """
+            INSERT INTO crm_claim_message_count AS mc (claim_id, message_count)
+            SELECT * FROM unnest(%s::int[], %s::int[])
+            ON CONFLICT (claim_id) DO UPDATE
+            SET message_count = mc.message_count + excluded.message_count
+            """,
+            [list(counts), list(counts.values())],
+        )
+        self.invalidate_model(["email"])
@@ -42,3 +42,60 @@ class TestCrmClaim(common.TransactionCase):
         self.assertIn("copy", new_claim.name)
         self.assertTrue(new_claim.stage_id.id)
         self.assertEqual(self.partner.claim_count, 2)
+
+    def test_claim_count_hierarchy(self):
+        contact = self.env["res.partner"].create(
+            {"name": "Partner Claim Contact", "parent_id": self.partner.id}
+        )
+        sub_contact = self.env["res.partner"].create(
+            {"name": "Partner Claim Sub Contact", "parent_id": contact.id}
+        )
+        Claims = self.env["crm.claim"].with_context(mail_create_nosubscribe=True)
+        Claims.create(
+            [
+                {"name": "Partner Claim", "partner_id": self.partner.id},
+                {"name": "Contact Claim", "partner_id": contact.id},
+                {"name": "Sub Contact Claim", "partner_id": sub_contact.id},
+                {"name": "Sub Contact Claim 2", "partner_id": sub_contact.id},
+            ]
+        )
+        partners = self.partner | contact | sub_contact
+        partners.invalidate_recordset(["claim_count"])
+        self.assertEqual(partners.mapped("claim_count"), [4, 3, 2])
+
+    def test_claim_report(self):
+        report_model = self.env["crm.claim.report"]
+        row = report_model.browse(self.claim.id)
+        messages_count = self.env["mail.message"].search_count(
+            [("model", "=", "crm.claim"), ("res_id", "=", self.claim.id)]
+        )
+        self.assertEqual(row.email, messages_count)
+        self.assertEqual(row.nbr_claims, 1)
+        message = self.claim.message_post(body="Claim message")
+        self.assertEqual(row.email, messages_count + 1)
+        message.unlink()
+        self.assertEqual(row.email, messages_count)
+        new_claim = self.claim.copy()
+        data = report_model.read_group(
+            [("id", "in", (self.claim | new_claim).ids)],
+            ["nbr_claims"],
+            ["team_id"],
+        )
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["nbr_claims"], 2)
+
+    def test_claim_report_init(self):
+        report_model = self.env["crm.claim.report"]
+
+        def view_oid():
+            self.env.cr.execute("SELECT to_regclass('crm_claim_report')::oid")
+            return self.env.cr.fetchone()[0]
+
+        oid = view_oid()
+        report_model.init()
+        self.assertEqual(view_oid(), oid)
+        # a view whose stored hash differs from its definition is rebuilt
+        self.env.cr.execute("COMMENT ON VIEW crm_claim_report IS NULL")
+        report_model.init()
+        self.assertNotEqual(view_oid(), oid)
+        self.assertEqual(report_model.browse(self.claim.id).nbr_claims, 1)
@@ -8,7 +8,7 @@
     "author": "Odoo S.A., Tecnativa, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/crm",
     "license": "AGPL-3",
-    "depends": ["crm", "calendar"],
+    "depends": ["crm", "calendar", "crm_sql_tools"],
     "data": [
         "security/crm_security.xml",
         "security/ir.model.access.csv",
@@ -18,6 +18,7 @@
         "views/crm_lead_view.xml",
         "views/res_config_settings_views.xml",
         "report/crm_phonecall_report_view.xml",
+        "data/ir_cron_data.xml",
     ],
     "installable": True,
 }
@@ -18,10 +18,9 @@ class CrmLead(models.Model):
 
     def _compute_phonecall_count(self):
         """Calculate number of phonecalls."""
+        counts = self.env["crm.phonecall"]._get_count_map("opportunity_id", self)
         for lead in self:
-            lead.phonecall_count = self.env["crm.phonecall"].search_count(
-                [("opportunity_id", "=", lead.id)]
-            )
+            lead.phonecall_count = counts.get(lead._origin.id, 0)
 
     def button_open_phonecall(self):
         self.ensure_one()
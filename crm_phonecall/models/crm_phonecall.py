@@ -2,10 +2,23 @@
 # Copyright 2017 Tecnativa - Vicent Cubells
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from functools import reduce
+from collections import defaultdict
 
 from odoo import _, api, fields, models
 
+# phonecall fields shown in the report, their changes are logged
+REPORT_FIELDS = (
+    "date_open",
+    "date_closed",
+    "state",
+    "user_id",
+    "team_id",
+    "partner_id",
+    "duration",
+    "company_id",
+    "priority",
+)
+
 
 class CrmPhonecall(models.Model):
     """Model for CRM phonecalls."""
@@ -13,7 +26,7 @@ class CrmPhonecall(models.Model):
     _name = "crm.phonecall"
     _description = "Phonecall"
     _order = "id desc"
-    _inherit = ["mail.thread", "utm.mixin"]
+    _inherit = ["mail.thread", "utm.mixin", "crm.count.mixin"]
 
     date_action_last = fields.Datetime(string="Last Action", readonly=True)
     date_action_next = fields.Datetime(string="Next Action", readonly=True)
@@ -89,6 +102,12 @@ class CrmPhonecall(models.Model):
             self.partner_id = self.opportunity_id.partner_id.id
             self.tag_ids = self.opportunity_id.tag_ids.ids
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        phonecalls = super().create(vals_list)
+        self.env["crm.phonecall.report"]._enqueue(phonecalls.ids)
+        return phonecalls
+
     def write(self, values):
         """Override to add case management: open/close dates."""
         if values.get("state"):
@@ -98,20 +117,27 @@ class CrmPhonecall(models.Model):
             elif values.get("state") == "open":
                 values["date_open"] = fields.Datetime.now()
                 values["duration"] = 0.0
+        if any(fname in values for fname in REPORT_FIELDS):
+            self.env["crm.phonecall.report"]._enqueue(self.ids)
         return super().write(values)
 
+    def unlink(self):
+        self.env["crm.phonecall.report"]._enqueue(self.ids)
+        return super().unlink()
+
     def compute_duration(self):
         """Calculate duration based on phonecall date."""
-        phonecall_dates = self.filtered("date")
-        phonecall_no_dates = self - phonecall_dates
-        for phonecall in phonecall_dates:
+        now = fields.Datetime.now()
+        ids_by_duration = defaultdict(list)
+        for phonecall in self:
             if phonecall.duration <= 0 and phonecall.date:
-                duration = fields.Datetime.now() - phonecall.date
-                values = {"duration": duration.seconds / 60.0}
-                phonecall.write(values)
+                duration = (now - phonecall.date).seconds / 60.0
             else:
-                phonecall.duration = 0.0
-        phonecall_no_dates.write({"duration": 0.0})
+                duration = 0.0
+            ids_by_duration[duration].append(phonecall.id)
+        # one write for every call with the same duration
+        for duration, ids in ids_by_duration.items():
+            self.browse(ids).write({"duration": duration})
         return True
 
     def get_values_schedule_another_phonecall(self, vals):
@@ -136,17 +162,14 @@ class CrmPhonecall(models.Model):
 
     def schedule_another_phonecall(self, vals, return_recordset=False):
         """Action :('schedule','Schedule a call'), ('log','Log a call')."""
-        phonecall_dict = {}
-        for call in self:
-            values = call.get_values_schedule_another_phonecall(vals)
-            new_id = self.create(values)
-            if vals.get("action") == "log":
-                call.write({"state": "done"})
-            phonecall_dict[call.id] = new_id
+        new_phonecalls = self.create(
+            [call.get_values_schedule_another_phonecall(vals) for call in self]
+        )
+        if vals.get("action") == "log":
+            self.write({"state": "done"})
         if return_recordset:
-            return reduce(lambda x, y: x + y, phonecall_dict.values())
-        else:
-            return phonecall_dict
+            return new_phonecalls
+        return dict(zip(self.ids, new_phonecalls))
 
     def redirect_phonecall_view(self):
         """Redirect on the phonecall related view."""
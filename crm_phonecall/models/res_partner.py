@@ -17,7 +17,6 @@ class ResPartner(models.Model):
 
     def _compute_phonecall_count(self):
         """Calculate number of phonecalls."""
+        counts = self.env["crm.phonecall"]._get_count_map("partner_id", self)
         for partner in self:
-            partner.phonecall_count = self.env["crm.phonecall"].search_count(
-                [("partner_id", "=", partner.id)]
-            )
+            partner.phonecall_count = counts.get(partner._origin.id, 0)
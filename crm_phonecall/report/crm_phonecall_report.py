@@ -3,7 +3,9 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 from psycopg2.extensions import AsIs
 
-from odoo import fields, models, tools
+from odoo import api, fields, models, tools
+
+from ..models.crm_phonecall import REPORT_FIELDS
 
 AVAILABLE_STATES = [
     ("draft", "Draft"),
@@ -15,9 +17,14 @@ AVAILABLE_STATES = [
 
 
 class CrmPhonecallReport(models.Model):
-    """Generate BI report based on phonecall."""
+    """Generate BI report based on phonecall.
+
+    The rows live in a real table, one per phonecall, refreshed from the
+    change log filled by the phonecalls, see _refresh_changed().
+    """
 
     _name = "crm.phonecall.report"
+    _inherit = "crm.sql.report.mixin"
     _description = "Phone calls by user"
     _auto = False
 
@@ -83,14 +90,123 @@ class CrmPhonecallReport(models.Model):
         """
         return from_str
 
+    def _where(self):
+        return """
+            where %(all)s or c.id = any(%(phonecall_ids)s)
+        """
+
+    def _columns(self):
+        """Columns of the table, the stored fields of the report, which
+        ``_select()`` must provide."""
+        return [name for name, field in self._fields.items() if field.store]
+
     def init(self):
-        """Initialize the report."""
+        """Initialize the report table and its change log.
+
+        The table is only created and filled again when its SQL definition
+        changes.
+        """
         tools.drop_view_if_exists(self.env.cr, self._table)
         self.env.cr.execute(
             """
-            create or replace view %s as (
-                %s
-                %s
-            )""",
-            (AsIs(self._table), AsIs(self._select()), AsIs(self._from())),
+            create table if not exists %s_queue (
+                phonecall_id integer not null
+            )
+            """,
+            (AsIs(self._table),),
+        )
+        # the phonecalls table is missing when the report is initialized
+        # first, the next update creates the report table
+        if not tools.table_exists(self.env.cr, self.env["crm.phonecall"]._table):
+            return
+        self._init_sql_relation(
+            self._table,
+            "TABLE",
+            (",".join(self._columns()), self._select(), self._from(), self._where()),
+            self._create_table,
+        )
+
+    def _create_table(self):
+        # the column types follow the select, an addon extending it does
+        # not have to declare them again
+        query = "drop table if exists %%(table)s; create table %%(table)s as %s" % (
+            self._get_rows_query()
         )
+        self.env.cr.execute(  # pylint: disable=sql-injection
+            query + " with no data; alter table %(table)s add primary key (id)",
+            {"table": AsIs(self._table), "all": False, "phonecall_ids": []},
+        )
+        for column in (
+            "user_id",
+            "team_id",
+            "state",
+            "create_date",
+            "opening_date",
+            "date_closed",
+        ):
+            tools.create_index(
+                self.env.cr,
+                "%s_%s_index" % (self._table, column),
+                self._table,
+                [column],
+            )
+        self._refresh()
+
+    def _get_rows_query(self):
+        """Query of the rows of the table, in the order of its columns."""
+        columns = ", ".join('"%s"' % column for column in self._columns())
+        return "select %s from (%s %s %s) as report_rows" % (
+            columns,
+            self._select(),
+            self._from(),
+            self._where(),
+        )
+
+    @api.model
+    def _refresh(self, phonecall_ids=None):
+        """Compute again the rows of the given phonecalls, of every phonecall
+        without ``phonecall_ids``."""
+        if phonecall_ids is not None and not phonecall_ids:
+            return
+        self.env["crm.phonecall"].flush_model(REPORT_FIELDS)
+        params = {
+            "table": AsIs(self._table),
+            "all": phonecall_ids is None,
+            "phonecall_ids": list(phonecall_ids or []),
+        }
+        if phonecall_ids is None:
+            self.env.cr.execute("truncate %(table)s, %(table)s_queue", params)
+        else:
+            self.env.cr.execute(
+                "delete from %(table)s where id = any(%(phonecall_ids)s)", params
+            )
+        query = "insert into %%(table)s (%s) %s" % (
+            ", ".join('"%s"' % column for column in self._columns()),
+            self._get_rows_query(),
+        )
+        self.env.cr.execute(query, params)  # pylint: disable=sql-injection
+        self.invalidate_model()
+
+    @api.model
+    def _enqueue(self, phonecall_ids):
+        """Log the phonecalls to refresh at the next incremental refresh."""
+        phonecall_ids = [phonecall_id for phonecall_id in phonecall_ids if phonecall_id]
+        if phonecall_ids:
+            self.env.cr.execute(
+                "insert into %s_queue select unnest(%s::int[])",
+                (AsIs(self._table), phonecall_ids),
+            )
+
+    @api.model
+    def _refresh_changed(self):
+        """Refresh the rows of the phonecalls changed since the previous
+        call, emptying the change log."""
+        self.env.cr.execute(
+            "delete from %s_queue returning phonecall_id", (AsIs(self._table),)
+        )
+        self._refresh({row[0] for row in self.env.cr.fetchall()})
+
+    @api.model
+    def _cron_rebuild(self):
+        """Compute again every row, for data changed outside the ORM."""
+        self._refresh()
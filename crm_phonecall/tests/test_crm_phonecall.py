@@ -177,6 +177,26 @@ class TestCrmPhoneCall(common.TransactionCase):
         self.assertEqual(result["search_view_id"], search_view_id)
         self.assertNotEqual(result["res_id"], self.phonecall1.id)
 
+    def test_schedule_another_phonecall_multi(self):
+        """Schedule another phonecall for several calls at once."""
+        phonecalls = self.phonecall1 | self.phonecall2
+        result = phonecalls.schedule_another_phonecall(
+            {"name": "Test multi schedule", "action": "log"}
+        )
+        self.assertEqual(list(result), phonecalls.ids)
+        for new_phonecall in result.values():
+            self.assertEqual(new_phonecall.name, "Test multi schedule")
+            self.assertNotIn(new_phonecall.id, phonecalls.ids)
+        self.assertEqual(result[self.phonecall1.id].partner_id, self.partner1)
+        self.assertEqual(phonecalls.mapped("state"), ["done", "done"])
+        self.assertTrue(all(phonecalls.mapped("date_closed")))
+        new_phonecalls = phonecalls.schedule_another_phonecall(
+            {"name": "Test multi schedule 2", "action": "schedule"},
+            return_recordset=True,
+        )
+        self.assertEqual(len(new_phonecalls), 2)
+        self.assertEqual(new_phonecalls.mapped("user_id"), phonecalls.user_id)
+
     def test_opportunity_open_phonecall(self):
         action_dict = self.opportunity2.button_open_phonecall()
         action_context = action_dict.get("context")
@@ -189,3 +209,72 @@ class TestCrmPhoneCall(common.TransactionCase):
         self.assertEqual(
             action_context.get("default_partner_id"), self.opportunity2.partner_id.id
         )
+
+    def test_phonecall_count(self):
+        self.phonecall2.write(
+            {"partner_id": self.partner2.id, "opportunity_id": self.opportunity1.id}
+        )
+        partners = self.partner1 | self.partner2
+        opportunities = self.opportunity1 | self.opportunity2
+        self.assertEqual(partners.mapped("phonecall_count"), [1, 1])
+        self.assertEqual(opportunities.mapped("phonecall_count"), [1, 0])
+
+    def test_phonecall_count_queries(self):
+        partners = self.partner1 | self.partner2
+        opportunities = self.opportunity1 | self.opportunity2
+        partners.mapped("phonecall_count")
+        opportunities.mapped("phonecall_count")
+        # one grouped query, whatever the number of records
+        for records in (partners[:1], partners, opportunities):
+            records.invalidate_recordset(["phonecall_count"])
+            with self.assertQueryCount(2):
+                records.mapped("phonecall_count")
+
+    def test_phonecall_report(self):
+        report_model = self.env["crm.phonecall.report"]
+        report_model._refresh_changed()
+        row = report_model.search([("id", "=", self.phonecall1.id)])
+        self.assertEqual(row.partner_id, self.partner1)
+        self.assertEqual(row.state, "open")
+        self.phonecall1.write({"state": "done", "partner_id": self.partner2.id})
+        report_model._refresh_changed()
+        self.assertEqual(row.partner_id, self.partner2)
+        self.assertEqual(row.state, "done")
+        self.assertTrue(row.date_closed)
+        data = report_model.read_group(
+            [("id", "in", (self.phonecall1 | self.phonecall2).ids)],
+            ["nbr_cases"],
+            ["state"],
+        )
+        self.assertEqual(
+            {item["state"]: item["nbr_cases"] for item in data},
+            {"done": 1, "open": 1},
+        )
+        self.phonecall2.unlink()
+        report_model._refresh_changed()
+        self.assertFalse(report_model.search([("id", "=", self.phonecall2.id)]))
+        self.phonecall1.write({"name": "Renamed call"})
+        # fields not shown in the report are not logged
+        self.env.cr.execute("SELECT count(*) FROM crm_phonecall_report_queue")
+        self.assertFalse(self.env.cr.fetchone()[0])
+        report_model._cron_rebuild()
+        phonecall_model = self.env["crm.phonecall"].with_context(active_test=False)
+        self.assertEqual(
+            report_model.search_count([]), phonecall_model.search_count([])
+        )
+
+    def test_phonecall_report_init(self):
+        report_model = self.env["crm.phonecall.report"]
+
+        def table_oid():
+            self.env.cr.execute("SELECT to_regclass('crm_phonecall_report')::oid")
+            return self.env.cr.fetchone()[0]
+
+        oid = table_oid()
+        report_model.init()
+        self.assertEqual(table_oid(), oid)
+        # a table whose stored hash differs from its definition is rebuilt
+        self.env.cr.execute("COMMENT ON TABLE crm_phonecall_report IS NULL")
+        report_model.init()
+        self.assertNotEqual(table_oid(), oid)
+        self.assertTrue(report_model.search([("id", "=", self.phonecall1.id)]))
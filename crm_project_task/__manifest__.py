@@ -16,6 +16,7 @@
     "depends": [
         "crm",
         "project",
+        "crm_sql_tools",
     ],
     "data": [
         "security/ir.model.access.csv",
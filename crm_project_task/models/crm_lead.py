@@ -12,8 +12,15 @@ class CrmLead(models.Model):
 
     @api.depends("task_ids")
     def _compute_task_count(self):
-        for lead in self:
+        # the leads edited in a form count their tasks in memory, with the
+        # unsaved ones
+        new_leads = self.filtered(lambda lead: not isinstance(lead.id, int))
+        for lead in new_leads:
             lead.task_count = len(lead.task_ids)
+        leads = self - new_leads
+        counts = self.env["project.task"]._get_count_map("lead_id", leads)
+        for lead in leads:
+            lead.task_count = counts.get(lead.id, 0)
 
     def action_tasks(self):
         self.ensure_one()
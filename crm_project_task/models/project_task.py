@@ -5,6 +5,7 @@ from odoo import fields, models
 
 
 class CrmLead(models.Model):
-    _inherit = "project.task"
+    _name = "project.task"
+    _inherit = ["project.task", "crm.count.mixin"]
 
     lead_id = fields.Many2one("crm.lead")
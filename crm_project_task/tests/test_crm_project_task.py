@@ -95,3 +95,29 @@ class TestCrmProjectTask(TransactionCase):
         tasks = self.env["project.task"].search(action["domain"])
         tasks_lead = tasks.mapped("lead_id")
         self.assertEqual(self.lead, tasks_lead)
+
+    def test_task_count(self):
+        lead2 = self.lead.copy()
+        self.env["project.task"].create(
+            [
+                {"name": "Task 1", "project_id": self.project.id, "lead_id": lead.id}
+                for lead in (self.lead, self.lead, lead2)
+            ]
+        )
+        leads = self.lead | lead2
+        self.assertEqual(leads.mapped("task_count"), [2, 1])
+        lead_new = lead2.new(origin=lead2)
+        lead_new.task_ids |= self.env["project.task"].new(
+            {"name": "Task 2", "project_id": self.project.id}
+        )
+        self.assertEqual(lead_new.task_count, 2)
+
+    def test_task_count_queries(self):
+        lead2 = self.lead.copy()
+        leads = self.lead | lead2
+        leads.mapped("task_count")
+        # one grouped query, whatever the number of leads
+        for records in (leads[:1], leads):
+            records.invalidate_recordset(["task_count"])
+            with self.assertQueryCount(2):
+                records.mapped("task_count")
@@ -1,5 +1,6 @@
 # Copyright 2021 Sygel - Valentin Vinagre
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
+from . import controllers
 from . import models
 from . import wizards
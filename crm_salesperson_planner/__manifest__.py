@@ -8,7 +8,7 @@
     "author": "Sygel Technology," "Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/crm",
     "license": "AGPL-3",
-    "depends": ["crm", "calendar"],
+    "depends": ["crm", "calendar", "crm_sql_tools"],
     "data": [
         "data/crm_salesperson_planner_sequence.xml",
         "wizards/crm_salesperson_planner_visit_close_wiz_view.xml",
@@ -16,8 +16,10 @@
         "views/crm_salesperson_planner_visit_views.xml",
         "views/crm_salesperson_planner_visit_close_reason_views.xml",
         "views/crm_salesperson_planner_visit_template_views.xml",
+        "views/crm_salesperson_planner_visit_load_views.xml",
         "views/crm_salesperson_planner_menu.xml",
         "views/res_partner.xml",
+        "views/calendar_event_views.xml",
         "views/crm_lead.xml",
         "data/ir_cron_data.xml",
         "security/crm_salesperson_planner_security.xml",
@@ -0,0 +1,63 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+import gzip
+import hashlib
+import json
+from datetime import timedelta
+
+from werkzeug.exceptions import BadRequest
+
+from odoo import fields, http
+from odoo.http import request
+from odoo.tools import date_utils
+
+from ..models.crm_salesperson_planner_sync_tombstone import TOMBSTONE_DAYS
+
+# smaller bodies are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+class SalespersonPlannerSync(http.Controller):
+    @http.route(
+        "/crm_salesperson_planner/sync",
+        type="http",
+        auth="user",
+        methods=["GET"],
+    )
+    def sync(self, since=None, **kwargs):
+        """Send the visits, customers and opportunities of the salesperson
+        changed since the ``since`` cursor, as compact JSON.
+
+        A cursor older than the kept tombstones asks the client to drop its
+        data and start again from the full scope (``reset``).
+        """
+        reset = False
+        if since:
+            try:
+                since = fields.Datetime.to_datetime(since)
+            except ValueError as error:
+                raise BadRequest("Invalid cursor") from error
+            if since < fields.Datetime.now() - timedelta(days=TOMBSTONE_DAYS):
+                since, reset = None, True
+        data = request.env["crm.salesperson.planner.visit"]._get_sync_data(since)
+        data["reset"] = reset
+        body = json.dumps(
+            data, separators=(",", ":"), default=date_utils.json_default
+        ).encode()
+        etag = hashlib.sha1(body).hexdigest()
+        headers = [
+            ("Content-Type", "application/json; charset=utf-8"),
+            ("Cache-Control", "private, no-cache"),
+            ("ETag", '"%s"' % etag),
+            ("Vary", "Accept-Encoding"),
+        ]
+        if etag in request.httprequest.if_none_match:
+            return request.make_response(b"", headers, status=304)
+        if (
+            len(body) >= GZIP_MIN_SIZE
+            and "gzip" in request.httprequest.accept_encodings
+        ):
+            body = gzip.compress(body)
+            headers.append(("Content-Encoding", "gzip"))
+        return request.make_response(body, headers)
@@ -7,3 +7,7 @@ from . import crm_salesperson_planner_visit_close_reason
 from . import res_partner
 from . import crm_lead
 from . import calendar_event
+from . import crm_salesperson_planner_visit_load
+from . import res_users
+from . import crm_salesperson_planner_sync_tombstone
+from . import ir_sequence
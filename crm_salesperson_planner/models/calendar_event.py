@@ -1,8 +1,13 @@
 # Copyright 2021 Sygel - Manuel Regidor
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
+from collections import defaultdict
+
 from odoo import _, fields, models
-from odoo.exceptions import ValidationError
+from odoo.exceptions import AccessError, ValidationError
+
+# events named in the error raised when deleting events of visits
+UNLINK_ERROR_LINES = 10
 
 
 class CalendarEvent(models.Model):
@@ -15,45 +20,92 @@ class CalendarEvent(models.Model):
     )
 
     def write(self, values):
-        if values.get("start") or values.get("user_id"):
-            salesperson_visit_events = self.filtered(
-                lambda a: a.res_model == "crm.salesperson.planner.visit"
+        if not (values.get("start") or values.get("user_id")):
+            return super().write(values)
+        salesperson_visit_events = self.filtered(
+            lambda a: a.res_model == "crm.salesperson.planner.visit"
+        )
+        if not salesperson_visit_events:
+            return super().write(values)
+        new_vals = {}
+        if values.get("start"):
+            new_vals["date"] = values.get("start")
+        if values.get("user_id"):
+            new_vals["user_id"] = values.get("user_id")
+        salesperson_visit_events.mapped("salesperson_planner_visit_ids").with_context(
+            bypass_update_event=True
+        ).write(new_vals)
+        user = self.env["res.users"].browse(values.get("user_id"))
+        if not user:
+            return super().write(values)
+        # the salesperson replaces the previous one in the attendees of each
+        # event, the events ending with the same attendees are written at once
+        events_by_partners = defaultdict(lambda: self.browse())
+        for event in salesperson_visit_events:
+            partners = (event.partner_ids - event.user_id.partner_id) | user.partner_id
+            events_by_partners[frozenset(partners.ids)] |= event
+        other_events = self - salesperson_visit_events
+        if other_events:
+            super(CalendarEvent, other_events).write(values)
+        for partner_ids, events in events_by_partners.items():
+            super(CalendarEvent, events).write(
+                dict(values, partner_ids=[(6, 0, list(partner_ids))])
             )
-            if salesperson_visit_events:
-                new_vals = {}
-                if values.get("start"):
-                    new_vals["date"] = values.get("start")
-                if values.get("user_id"):
-                    new_vals["user_id"] = values.get("user_id")
-                    user_id = self.env["res.users"].browse(values.get("user_id"))
-                    if user_id:
-                        partner_ids = self.partner_ids.filtered(
-                            lambda a: a != self.user_id.partner_id
-                        ).ids
-                        partner_ids.append(user_id.partner_id.id)
-                        values["partner_ids"] = [(6, 0, partner_ids)]
-                salesperson_visit_events.mapped(
-                    "salesperson_planner_visit_ids"
-                ).with_context(bypass_update_event=True).write(new_vals)
-        return super().write(values)
+        return True
+
+    def _get_salesperson_planner_visits(self):
+        """Return the visits linked to the events, found with one query."""
+        Visit = self.env["crm.salesperson.planner.visit"]
+        if not self.ids:
+            return Visit
+        Visit.flush_model(["calendar_event_id"])
+        self.flush_recordset(["res_model"])
+        self.env.cr.execute(
+            """
+            SELECT visit.id
+            FROM crm_salesperson_planner_visit visit
+            JOIN calendar_event event ON event.id = visit.calendar_event_id
+            WHERE event.id = ANY(%s) AND event.res_model = %s
+            ORDER BY visit.id
+            """,
+            [self.ids, Visit._name],
+        )
+        return Visit.browse([row[0] for row in self.env.cr.fetchall()])
 
     def unlink(self):
         if not self.env.context.get("bypass_cancel_visit"):
-            salesperson_visit_events = self.filtered(
-                lambda a: a.res_model == "crm.salesperson.planner.visit"
-                and a.salesperson_planner_visit_ids
-            )
-            if salesperson_visit_events:
-                error_msg = ""
-                for event in salesperson_visit_events:
-                    error_msg += _(
+            visits = self._get_salesperson_planner_visits().sudo()
+            if visits:
+                # one line per event, as the first visits found name them
+                visit_by_event = {}
+                for visit in visits:
+                    visit_by_event.setdefault(visit.calendar_event_id, visit)
+                lines = [
+                    _(
                         "Event %(event_name)s is related to salesperson visit "
                         "%(partner_name)s. Cancel it to delete this event.\n"
-                    ) % {
-                        "event_name": event.name,
-                        "partner_name": fields.first(
-                            event.salesperson_planner_visit_ids
-                        ).name,
-                    }
-                raise ValidationError(error_msg)
+                    )
+                    % {"event_name": event.name, "partner_name": visit.name}
+                    for event, visit in list(visit_by_event.items())[
+                        :UNLINK_ERROR_LINES
+                    ]
+                ]
+                if len(visit_by_event) > UNLINK_ERROR_LINES:
+                    lines.append(
+                        _("... and %s other events.\n")
+                        % (len(visit_by_event) - UNLINK_ERROR_LINES)
+                    )
+                raise ValidationError("".join(lines))
         return super().unlink()
+
+    def action_cancel_visits_and_unlink(self):
+        """Cancel the open salesperson visits of the events, then delete the
+        events, for administrators purging the calendar."""
+        if not self.env.is_admin():
+            raise AccessError(
+                _("Only administrators can delete the events of salesperson visits.")
+            )
+        self._get_salesperson_planner_visits().filtered(
+            lambda a: a.state in ("draft", "confirm")
+        ).write({"state": "cancel"})
+        return self.with_context(bypass_cancel_visit=True).unlink()
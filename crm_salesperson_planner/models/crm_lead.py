@@ -14,3 +14,9 @@ class CrmLead(models.Model):
         copy=False,
         domain="[('partner_id', 'child_of', partner_id)]",
     )
+
+    def unlink(self):
+        self.env["crm.salesperson.planner.sync.tombstone"]._record(
+            self._name, {False: self.filtered("crm_salesperson_planner_visit_ids").ids}
+        )
+        return super().unlink()
@@ -0,0 +1,59 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+# tombstones older than this are purged, older cursors need a full sync
+TOMBSTONE_DAYS = 30
+
+
+class CrmSalespersonPlannerSyncTombstone(models.Model):
+    """Records removed from the scope of the mobile synchronisation."""
+
+    _name = "crm.salesperson.planner.sync.tombstone"
+    _description = "Salesperson Planner Sync Tombstone"
+    _order = "id"
+    _log_access = False
+
+    res_model = fields.Char(required=True, index=True)
+    res_id = fields.Integer(required=True)
+    user_id = fields.Many2one(
+        comodel_name="res.users",
+        help="Salesperson losing the record, empty when every salesperson does",
+        index=True,
+        ondelete="cascade",
+    )
+    date = fields.Datetime(required=True, index=True, default=fields.Datetime.now)
+
+    @api.model
+    def _record(self, model, ids_by_user):
+        """Store the tombstones of ``model`` records, given by user id."""
+        vals_list = [
+            {"res_model": model, "res_id": res_id, "user_id": user_id}
+            for user_id, ids in ids_by_user.items()
+            for res_id in ids
+        ]
+        if vals_list:
+            self.sudo().create(vals_list)
+
+    @api.model
+    def _get_deleted(self, since, user):
+        """Return the ids removed for ``user`` since ``since``, by model."""
+        deleted = defaultdict(set)
+        for tombstone in self.sudo().search(
+            [
+                ("date", ">=", since),
+                ("user_id", "in", [user.id, False]),
+            ]
+        ):
+            deleted[tombstone.res_model].add(tombstone.res_id)
+        return deleted
+
+    @api.model
+    def _cron_purge(self, days=TOMBSTONE_DAYS):
+        self.sudo().search(
+            [("date", "<", fields.Datetime.now() - timedelta(days=days))]
+        ).unlink()
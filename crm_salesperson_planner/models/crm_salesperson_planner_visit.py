@@ -2,8 +2,61 @@
 # Copyright 2021 Sygel - Manuel Regidor
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
-from odoo import _, api, fields, models
-from odoo.exceptions import ValidationError
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from odoo import _, api, fields, models, tools
+from odoo.exceptions import UserError, ValidationError
+
+_logger = logging.getLogger(__name__)
+
+# visits taking a slot in the day of their salesperson
+LOAD_STATES = ("draft", "confirm", "done")
+
+CLOSE_REASON_IMAGE_FIELDS = (
+    "close_reason_image",
+    "close_reason_image_1024",
+    "close_reason_image_128",
+)
+
+# records whose write date is this close to the cursor are sent again
+SYNC_OVERLAP = timedelta(minutes=1)
+SYNC_PAST_DAYS = 7
+SYNC_VISIT_FIELDS = [
+    "name",
+    "date",
+    "sequence",
+    "state",
+    "partner_id",
+    "opportunity_ids",
+    "description",
+    "close_reason_id",
+    "close_reason_notes",
+    "write_date",
+]
+SYNC_PARTNER_FIELDS = [
+    "display_name",
+    "parent_id",
+    "street",
+    "street2",
+    "zip",
+    "city",
+    "phone",
+    "mobile",
+    "email",
+    "write_date",
+]
+SYNC_OPPORTUNITY_FIELDS = [
+    "name",
+    "partner_id",
+    "stage_id",
+    "expected_revenue",
+    "probability",
+    "active",
+    "write_date",
+]
 
 
 class CrmSalespersonPlannerVisit(models.Model):
@@ -75,7 +128,18 @@ class CrmSalespersonPlannerVisit(models.Model):
     close_reason_id = fields.Many2one(
         comodel_name="crm.salesperson.planner.visit.close.reason", string="Close Reason"
     )
-    close_reason_image = fields.Image(max_width=1024, max_height=1024, attachment=True)
+    close_reason_image = fields.Image(
+        attachment=True,
+        help="Photo as uploaded, kept as is, its resized versions being "
+        "computed in the background",
+    )
+    close_reason_image_1024 = fields.Image(
+        max_width=1024, max_height=1024, attachment=True, copy=False
+    )
+    close_reason_image_128 = fields.Image(
+        max_width=128, max_height=128, attachment=True, copy=False
+    )
+    close_reason_image_pending = fields.Boolean(index=True, copy=False)
     close_reason_notes = fields.Text()
     visit_template_id = fields.Many2one(
         comodel_name="crm.salesperson.planner.visit.template", string="Visit Template"
@@ -84,6 +148,11 @@ class CrmSalespersonPlannerVisit(models.Model):
         comodel_name="calendar.event", string="Calendar Event"
     )
 
+    overbooked = fields.Boolean(
+        compute="_compute_overbooked",
+        help="The salesperson has more visits this day than the daily capacity",
+    )
+
     _sql_constraints = [
         (
             "crm_salesperson_planner_visit_name",
@@ -92,22 +161,213 @@ class CrmSalespersonPlannerVisit(models.Model):
         ),
     ]
 
+    def init(self):
+        tools.create_index(
+            self.env.cr,
+            "crm_salesperson_planner_visit_template_date_index",
+            self._table,
+            ["visit_template_id", "date"],
+        )
+
     @api.model_create_multi
     def create(self, vals_list):
+        to_name = [vals for vals in vals_list if vals.get("name", "/") == "/"]
+        names = self.env["ir.sequence"]._next_by_code_batch(
+            "salesperson.planner.visit", len(to_name)
+        )
+        for vals, name in zip(to_name, names):
+            vals["name"] = name
         for vals in vals_list:
-            if vals.get("name", "/") == "/":
-                vals["name"] = self.env["ir.sequence"].next_by_code(
-                    "salesperson.planner.visit"
+            if vals.get("close_reason_image"):
+                vals.update(
+                    self._get_close_reason_image_vals(vals["close_reason_image"])
                 )
-        return super().create(vals_list)
+        visits = super().create(vals_list)
+        self.env["crm.salesperson.planner.visit.load"]._add_load(
+            visits._get_visit_load()
+        )
+        if any(visits.mapped("close_reason_image_pending")):
+            self._trigger_close_reason_image_processing()
+        return visits
+
+    @api.model
+    def _get_close_reason_image_vals(self, image):
+        """Values storing a new close reason photo as uploaded, its resized
+        versions being left to the background processing."""
+        return {
+            "close_reason_image_1024": False,
+            "close_reason_image_128": False,
+            "close_reason_image_pending": bool(image),
+        }
+
+    @api.model
+    def _trigger_close_reason_image_processing(self):
+        cron = self.env.ref(
+            "crm_salesperson_planner.ir_cron_process_close_reason_images",
+            raise_if_not_found=False,
+        )
+        if cron:
+            cron._trigger()
+
+    def _process_close_reason_images(self):
+        """Store the resized versions of the pending photos, the uploaded
+        photo being kept."""
+        for visit in self:
+            try:
+                visit.write(
+                    {
+                        "close_reason_image_1024": visit.close_reason_image,
+                        "close_reason_image_128": visit.close_reason_image,
+                        "close_reason_image_pending": False,
+                    }
+                )
+            except UserError as error:
+                _logger.warning(
+                    "Close reason photo of visit %s not processed: %s", visit.id, error
+                )
+                visit.close_reason_image_pending = False
+
+    def _cron_process_close_reason_images(self, batch_size=50):
+        """Process the pending close reason photos by chunks of batch_size
+        visits, committing after each chunk."""
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        while True:
+            visits = self.search(
+                [("close_reason_image_pending", "=", True)], limit=batch_size
+            )
+            if not visits:
+                break
+            visits._process_close_reason_images()
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+            self.env.invalidate_all()
+        _logger.info(
+            "Close reason photos storage: %s", self._get_close_reason_image_storage()
+        )
+
+    @api.model
+    def _get_close_reason_image_storage(self):
+        """Size of the close reason photos, as attached to the visits and as
+        written in the filestore, where identical contents share a file."""
+        self.env["ir.attachment"].flush_model()
+        self.env.cr.execute(
+            """
+            SELECT count(*), coalesce(sum(file_size), 0),
+                count(DISTINCT checksum)
+            FROM ir_attachment
+            WHERE res_model = %s AND res_field IN %s
+            """,
+            (self._name, CLOSE_REASON_IMAGE_FIELDS),
+        )
+        attachments, size, files = self.env.cr.fetchone()
+        self.env.cr.execute(
+            """
+            SELECT coalesce(sum(file_size), 0) FROM (
+                SELECT DISTINCT ON (checksum) file_size
+                FROM ir_attachment
+                WHERE res_model = %s AND res_field IN %s
+            ) files
+            """,
+            (self._name, CLOSE_REASON_IMAGE_FIELDS),
+        )
+        return {
+            "attachments": attachments,
+            "size": size,
+            "files": files,
+            "file_size": self.env.cr.fetchone()[0],
+        }
+
+    @api.depends("user_id", "date", "state")
+    def _compute_overbooked(self):
+        visits = self.filtered(
+            lambda a: a.date and a.user_id.salesperson_planner_daily_capacity
+        )
+        load_map = visits and self.env[
+            "crm.salesperson.planner.visit.load"
+        ]._get_load_map(visits.user_id, min(visits.mapped("date")))
+        for visit in self:
+            visit.overbooked = (
+                visit in visits
+                and load_map[(visit.user_id.id, visit.date)]
+                > visit.user_id.salesperson_planner_daily_capacity
+            )
+
+    def _get_visit_load(self):
+        """Return the number of visits taking a slot per (user id, date)."""
+        return Counter(
+            (visit.user_id.id, visit.date)
+            for visit in self
+            if visit.user_id and visit.date and visit.state in LOAD_STATES
+        )
+
+    def _get_ids_by_user(self):
+        ids_by_user = defaultdict(list)
+        for visit in self.filtered("user_id"):
+            ids_by_user[visit.user_id.id].append(visit.id)
+        return ids_by_user
+
+    def _get_sync_domain(self, date_from):
+        return [("user_id", "=", self.env.uid), ("date", ">=", date_from)]
+
+    @api.model
+    def _get_sync_data(self, since=None, days=SYNC_PAST_DAYS):
+        """Return the visits of the current salesperson from ``days`` days
+        ago, with their customers and opportunities, changed since the
+        ``since`` cursor (all of them without cursor), and the ids removed
+        from the salesperson scope since then.
+
+        The cursor is compared with a margin, as transactions started before
+        the previous synchronisation may commit records with an older write
+        date. The returned cursor is the last write date sent. Visits getting
+        older than ``days`` days are left to the client to discard.
+        """
+        date_from = fields.Date.context_today(self) - timedelta(days=days)
+        scope = self.search(self._get_sync_domain(date_from))
+        opportunity_scope = scope.with_context(active_test=False).opportunity_ids
+        visits = scope
+        partners = self.env["res.partner"]
+        opportunities = self.env["crm.lead"]
+        deleted = {}
+        if since:
+            changed = [("write_date", ">=", since - SYNC_OVERLAP)]
+            visits = scope.filtered_domain(changed)
+            partners = scope.partner_id.filtered_domain(changed)
+            opportunities = opportunity_scope.filtered_domain(changed)
+            deleted = self.env["crm.salesperson.planner.sync.tombstone"]._get_deleted(
+                since - SYNC_OVERLAP, self.env.user
+            )
+        # a visit entering the scope brings along records the client lacks
+        partners |= visits.partner_id
+        opportunities |= visits.with_context(active_test=False).opportunity_ids
+        records = {
+            "visits": visits.read(SYNC_VISIT_FIELDS, load=None),
+            "partners": partners._filter_access_rules("read").read(
+                SYNC_PARTNER_FIELDS, load=None
+            ),
+            "opportunities": opportunities._filter_access_rules("read").read(
+                SYNC_OPPORTUNITY_FIELDS, load=None
+            ),
+        }
+        write_dates = [row["write_date"] for rows in records.values() for row in rows]
+        if since:
+            write_dates.append(since)
+        return dict(
+            records,
+            cursor=write_dates and max(write_dates) or None,
+            deleted={
+                "visits": sorted(deleted.get(self._name, set()) - set(scope.ids)),
+                "opportunities": sorted(
+                    deleted.get("crm.lead", set()) - set(opportunity_scope.ids)
+                ),
+            },
+        )
 
     def action_draft(self):
-        if self.state not in ["cancel", "incident", "done"]:
+        if self.filtered(lambda a: a.state not in ["cancel", "incident", "done"]):
             raise ValidationError(
                 _("The visit must be in cancelled, incident or visited state")
             )
-        if self.calendar_event_id:
-            self.calendar_event_id.with_context(bypass_cancel_visit=True).unlink()
+        self._unlink_calendar_events()
         self.write({"state": "draft"})
 
     def action_confirm(self):
@@ -118,15 +378,19 @@ class CrmSalespersonPlannerVisit(models.Model):
             self.browse(events.mapped("res_id")).write({"state": "confirm"})
 
     def action_done(self):
-        if not self.state == "confirm":
+        if self.filtered(lambda a: not a.state == "confirm"):
             raise ValidationError(_("The visit must be in confirmed state"))
         self.write({"state": "done"})
 
+    def _unlink_calendar_events(self):
+        events = self.mapped("calendar_event_id")
+        if events:
+            events.with_context(bypass_cancel_visit=True).unlink()
+
     def action_cancel(self, reason_id, image=None, notes=None):
-        if self.state not in ["draft", "confirm"]:
+        if self.filtered(lambda a: a.state not in ["draft", "confirm"]):
             raise ValidationError(_("The visit must be in draft or validated state"))
-        if self.calendar_event_id:
-            self.calendar_event_id.with_context(bypass_cancel_visit=True).unlink()
+        self._unlink_calendar_events()
         self.write(
             {
                 "state": "cancel",
@@ -147,26 +411,46 @@ class CrmSalespersonPlannerVisit(models.Model):
             "stop": self.date,
             "allday": True,
             "res_model": self._name,
-            "res_model_id": self.env.ref(
-                "crm_salesperson_planner.model_crm_salesperson_planner_visit"
-            ).id,
+            "res_model_id": self.env["ir.model"]._get_id(self._name),
             "res_id": self.id,
         }
 
     def create_calendar_event(self):
-        events = self.env["calendar.event"]
-        for item in self:
-            event = self.env["calendar.event"].create(
-                item._prepare_calendar_event_vals()
+        """Create the events of all the visits with one create, without
+        notifying the attendees nor logging each creation, and link them
+        back to their visits with one query."""
+        if not self:
+            return self.env["calendar.event"]
+        events = (
+            self.env["calendar.event"]
+            .with_context(
+                dont_notify=True,
+                mail_create_nolog=True,
+                mail_create_nosubscribe=True,
+                mail_notrack=True,
             )
-            if event:
-                event.activity_ids.unlink()
-                item.calendar_event_id = event
-            events += event
+            .create([item._prepare_calendar_event_vals() for item in self])
+            .with_env(self.env)
+        )
+        events.activity_ids.unlink()
+        self.flush_recordset(["calendar_event_id"])
+        self.env.cr.execute(
+            """
+            UPDATE crm_salesperson_planner_visit visit
+            SET calendar_event_id = event.id
+            FROM calendar_event event
+            WHERE event.id IN %s
+                AND event.res_model = %s
+                AND visit.id = event.res_id
+            """,
+            [tuple(events.ids), self._name],
+        )
+        self.invalidate_recordset(["calendar_event_id"])
+        events.invalidate_recordset(["salesperson_planner_visit_ids"])
         return events
 
     def action_incident(self, reason_id, image=None, notes=None):
-        if self.state not in ["draft", "confirm"]:
+        if self.filtered(lambda a: a.state not in ["draft", "confirm"]):
             raise ValidationError(_("The visit must be in draft or validated state"))
         self.write(
             {
@@ -177,22 +461,72 @@ class CrmSalespersonPlannerVisit(models.Model):
             }
         )
 
+    def _reschedule(self, date, sequence=None):
+        """Create and confirm the copies of the visits at the given date, at
+        once. The copies keep the sequence of their visit unless one is
+        given."""
+        vals_list = [
+            visit.copy_data(
+                {
+                    "date": date,
+                    "sequence": visit.sequence if sequence is None else sequence,
+                    "opportunity_ids": [(6, 0, visit.opportunity_ids.ids)],
+                }
+            )[0]
+            for visit in self
+        ]
+        visits = self.create(vals_list)
+        visits.action_confirm()
+        return visits
+
     def unlink(self):
         if any(sel.state not in ["draft", "cancel"] for sel in self):
             raise ValidationError(_("Visits must be in cancelled state"))
-        return super().unlink()
+        load = self._get_visit_load()
+        self.env["crm.salesperson.planner.sync.tombstone"]._record(
+            self._name, self._get_ids_by_user()
+        )
+        res = super().unlink()
+        self.env["crm.salesperson.planner.visit.load"]._add_load(
+            {key: -count for key, count in load.items()}
+        )
+        return res
 
     def write(self, values):
+        if "close_reason_image" in values:
+            values = dict(
+                values,
+                **self._get_close_reason_image_vals(values["close_reason_image"])
+            )
+        update_load = {"user_id", "date", "state"} & set(values)
+        if update_load:
+            load = self._get_visit_load()
+        if "user_id" in values:
+            self.env["crm.salesperson.planner.sync.tombstone"]._record(
+                self._name,
+                self.filtered(
+                    lambda a: a.user_id.id != values["user_id"]
+                )._get_ids_by_user(),
+            )
         ret_val = super().write(values)
+        if values.get("close_reason_image_pending"):
+            self._trigger_close_reason_image_processing()
+        if update_load:
+            load.subtract(self._get_visit_load())
+            self.env["crm.salesperson.planner.visit.load"]._add_load(
+                {key: -count for key, count in load.items()}
+            )
         if (values.get("date") or values.get("user_id")) and not self.env.context.get(
             "bypass_update_event"
         ):
             new_vals = {}
-            for item in self.filtered(lambda a: a.calendar_event_id):
-                if values.get("date"):
-                    new_vals["start"] = values.get("date")
-                    new_vals["stop"] = values.get("date")
-                if values.get("user_id"):
-                    new_vals["user_id"] = values.get("user_id")
-                item.calendar_event_id.write(new_vals)
+            if values.get("date"):
+                new_vals["start"] = values.get("date")
+                new_vals["stop"] = values.get("date")
+            if values.get("user_id"):
+                new_vals["user_id"] = values.get("user_id")
+            # every visit gets the same values, their events are written at once
+            events = self.mapped("calendar_event_id")
+            if events:
+                events.write(new_vals)
         return ret_val
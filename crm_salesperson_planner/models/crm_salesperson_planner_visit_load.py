@@ -0,0 +1,128 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from collections import defaultdict
+
+from odoo import api, fields, models, tools
+
+from .crm_salesperson_planner_visit import LOAD_STATES
+
+
+class CrmSalespersonPlannerVisitLoad(models.Model):
+    _name = "crm.salesperson.planner.visit.load"
+    _description = "Salesperson Planner Daily Load"
+    _order = "date desc, user_id"
+    _log_access = False
+
+    user_id = fields.Many2one(
+        comodel_name="res.users",
+        string="Salesperson",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+    date = fields.Date(required=True, readonly=True)
+    visit_count = fields.Integer(string="Visits", readonly=True)
+    capacity = fields.Integer(
+        related="user_id.salesperson_planner_daily_capacity",
+        string="Daily Capacity",
+    )
+    overbooked = fields.Boolean(
+        compute="_compute_overbooked", search="_search_overbooked"
+    )
+
+    _sql_constraints = [
+        (
+            "user_date_uniq",
+            "UNIQUE (user_id, date)",
+            "The load of a salesperson is kept once per day!",
+        ),
+    ]
+
+    def init(self):
+        self.env.cr.execute("SELECT 1 FROM crm_salesperson_planner_visit_load LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild()
+
+    @api.depends("visit_count", "capacity")
+    def _compute_overbooked(self):
+        for sel in self:
+            sel.overbooked = bool(sel.capacity) and sel.visit_count > sel.capacity
+
+    def _search_overbooked(self, operator, value):
+        self.flush_model()
+        self.env["res.users"].flush_model(["salesperson_planner_daily_capacity"])
+        self.env.cr.execute(
+            """
+            SELECT load.id
+            FROM crm_salesperson_planner_visit_load load
+            JOIN res_users users ON users.id = load.user_id
+            WHERE users.salesperson_planner_daily_capacity > 0
+                AND load.visit_count > users.salesperson_planner_daily_capacity
+            """
+        )
+        load_ids = [row[0] for row in self.env.cr.fetchall()]
+        positive = (operator == "=") == bool(value)
+        return [("id", "in" if positive else "not in", load_ids)]
+
+    def _rebuild(self):
+        """Compute again the whole table from the visits."""
+        visit_model = self.env["crm.salesperson.planner.visit"]
+        if not tools.table_exists(self.env.cr, visit_model._table):
+            # the visits are created after, they fill the table themselves
+            return
+        visit_model.flush_model(["user_id", "date", "state"])
+        self.env.cr.execute("DELETE FROM crm_salesperson_planner_visit_load")
+        self.env.cr.execute(
+            """
+            INSERT INTO crm_salesperson_planner_visit_load
+                (user_id, date, visit_count)
+            SELECT user_id, date, COUNT(*)
+            FROM crm_salesperson_planner_visit
+            WHERE user_id IS NOT NULL AND state IN %s
+            GROUP BY user_id, date
+            """,
+            [LOAD_STATES],
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _add_load(self, deltas):
+        """Add the visit count deltas given by (user id, date) to the table,
+        with one query."""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        user_ids, dates = zip(*deltas)
+        self.env.cr.execute(
+            """
+            INSERT INTO crm_salesperson_planner_visit_load
+                (user_id, date, visit_count)
+            SELECT * FROM unnest(%s::int[], %s::date[], %s::int[])
+            ON CONFLICT (user_id, date) DO UPDATE
+            SET visit_count = crm_salesperson_planner_visit_load.visit_count
+                + EXCLUDED.visit_count
+            """,
+            [list(user_ids), list(dates), list(deltas.values())],
+        )
+        self.invalidate_model(["visit_count"])
+
+    @api.model
+    def _get_load_map(self, users, date_from):
+        """Return the number of visits of the salespersons per (user id, date)
+        from the given date, as a dict to look the load up and book the
+        visits being generated."""
+        load_map = defaultdict(int)
+        if not users or not date_from:
+            return load_map
+        self.env.cr.execute(
+            """
+            SELECT user_id, date, visit_count
+            FROM crm_salesperson_planner_visit_load
+            WHERE user_id IN %s AND date >= %s
+            """,
+            [tuple(users.ids), date_from],
+        )
+        for user_id, date, visit_count in self.env.cr.fetchall():
+            load_map[(user_id, date)] = visit_count
+        return load_map
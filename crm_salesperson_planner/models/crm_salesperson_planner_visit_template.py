@@ -2,13 +2,43 @@
 # Copyright 2021 Sygel - Manuel Regidor
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
-from datetime import timedelta
+import threading
+from collections import defaultdict
+from datetime import datetime, time, timedelta
 
+from dateutil import rrule
 from dateutil.relativedelta import relativedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
 
+CRON_CURSOR_PARAM = "crm_salesperson_planner.create_visits_cursor"
+
+RRULE_FREQ = {
+    "daily": rrule.DAILY,
+    "weekly": rrule.WEEKLY,
+    "monthly": rrule.MONTHLY,
+    "yearly": rrule.YEARLY,
+}
+RRULE_WEEKDAY_FIELDS = {
+    "mon": rrule.MO,
+    "tue": rrule.TU,
+    "wed": rrule.WE,
+    "thu": rrule.TH,
+    "fri": rrule.FR,
+    "sat": rrule.SA,
+    "sun": rrule.SU,
+}
+RRULE_WEEKDAY = {
+    "MON": rrule.MO,
+    "TUE": rrule.TU,
+    "WED": rrule.WE,
+    "THU": rrule.TH,
+    "FRI": rrule.FR,
+    "SAT": rrule.SA,
+    "SUN": rrule.SU,
+}
+
 
 class CrmSalespersonPlannerVisitTemplate(models.Model):
     _name = "crm.salesperson.planner.visit.template"
@@ -75,6 +105,12 @@ class CrmSalespersonPlannerVisitTemplate(models.Model):
         required=True,
     )
     last_visit_date = fields.Date(compute="_compute_last_visit_date", store=True)
+    last_occurrence_date = fields.Date(
+        readonly=True,
+        copy=False,
+        help="Last date of the recurrence with a visit created, the visits "
+        "spilled to later days keep it",
+    )
     final_date = fields.Date(string="Repeat Until")
     allday = fields.Boolean(default=True)
     recurrency = fields.Boolean(default=True)
@@ -101,8 +137,25 @@ class CrmSalespersonPlannerVisitTemplate(models.Model):
 
     @api.depends("visit_ids.date")
     def _compute_last_visit_date(self):
-        for sel in self.filtered(lambda x: x.visit_ids):
-            sel.last_visit_date = sel.visit_ids.sorted(lambda x: x.date)[-1].date
+        templates = self.filtered("id")
+        last_dates = {}
+        if templates:
+            self.env["crm.salesperson.planner.visit"].flush_model(
+                ["date", "visit_template_id"]
+            )
+            # served by the (visit_template_id, date) index of the visits
+            self.env.cr.execute(
+                """
+                SELECT visit_template_id, MAX(date)
+                FROM crm_salesperson_planner_visit
+                WHERE visit_template_id IN %s
+                GROUP BY visit_template_id
+                """,
+                [tuple(templates.ids)],
+            )
+            last_dates = dict(self.env.cr.fetchall())
+        for sel in self:
+            sel.last_visit_date = last_dates.get(sel.id, False)
 
     @api.constrains("partner_ids")
     def _constrains_partner_ids(self):
@@ -112,13 +165,24 @@ class CrmSalespersonPlannerVisitTemplate(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if vals.get("name", "/") == "/":
-                vals["name"] = self.env["ir.sequence"].next_by_code(
-                    "salesperson.planner.visit.template"
-                )
+        to_name = [vals for vals in vals_list if vals.get("name", "/") == "/"]
+        names = self.env["ir.sequence"]._next_by_code_batch(
+            "salesperson.planner.visit.template", len(to_name)
+        )
+        for vals, name in zip(to_name, names):
+            vals["name"] = name
+        if self.env.context.get("planner_bulk_import"):
+            # as in write, skip the calendar event machinery (attendees,
+            # invitations, alarms, recurrences) and the chatter
+            return super(models.Model, self).create(vals_list)
         return super().create(vals_list)
 
+    @api.model
+    def _create_bulk(self, vals_list):
+        """Create many templates at once, as the ones of a new territory,
+        without the calendar event side effects nor the chatter."""
+        return self.with_context(planner_bulk_import=True).create(vals_list)
+
     # overwrite
     # Calling _update_cron from default write funciont is not
     # necessary in this case
@@ -162,8 +226,69 @@ class CrmSalespersonPlannerVisitTemplate(models.Model):
             for date in dates
         ]
 
+    def _get_rrule_params(self):
+        """Return the recurrence options of the template as the hashable
+        arguments of a dateutil rrule, without its start and end dates."""
+        self.ensure_one()
+        params = {
+            "freq": RRULE_FREQ[self.rrule_type],
+            "interval": max(self.interval, 1),
+        }
+        if self.rrule_type == "weekly":
+            weekdays = tuple(
+                weekday
+                for fname, weekday in RRULE_WEEKDAY_FIELDS.items()
+                if self[fname]
+            )
+            if weekdays:
+                params["byweekday"] = weekdays
+        elif self.rrule_type == "monthly":
+            if self.month_by == "day" and self.byday and self.weekday:
+                params["byweekday"] = (RRULE_WEEKDAY[self.weekday](int(self.byday)),)
+            elif self.month_by == "date" and self.day:
+                params["bymonthday"] = (self.day,)
+        if self.end_type != "forever" and not (
+            self.end_type == "end_date" and self.final_date
+        ):
+            params["count"] = max(self.count, 1)
+        return tuple(sorted(params.items()))
+
+    def _get_rrule_key(self):
+        """Return what the rrule of the template is built from."""
+        until = self.end_type == "end_date" and self.final_date
+        return self._get_rrule_params(), self.start_date, until or False
+
+    def _get_rrule(self, cache=None):
+        """The rrule of the template. The start date is not a visit date:
+        the occurrences are the ones following it, ``count`` of them when
+        the recurrence is limited.
+
+        ``cache`` is a dict shared by the templates of one generation pass,
+        in which the templates with the same recurrence and start date share
+        their rule and their dates.
+        """
+        self.ensure_one()
+        cache = {} if cache is None else cache
+        key = ("rrule",) + self._get_rrule_key()
+        if key not in cache:
+            params = dict(self._get_rrule_params())
+            start = datetime.combine(self.start_date, time.min)
+            until = None
+            if self.end_type == "end_date" and self.final_date:
+                until = datetime.combine(self.final_date, time.min)
+            rule = rrule.rrule(dtstart=start, until=until, **params)
+            if "count" in params and rule[0] == start:
+                rule = rule.replace(count=params["count"] + 1)
+            cache[key] = rule
+        return cache[key]
+
     def _get_max_date(self):
-        return self._increase_date(self.start_date, self.count)
+        if not self.start_date:
+            return False
+        if self.end_type == "forever":
+            return False
+        occurrences = list(self._get_rrule())
+        return occurrences[-1].date() if occurrences else self.start_date
 
     def _increase_date(self, date, value):
         if self.rrule_type == "daily":
@@ -176,32 +301,132 @@ class CrmSalespersonPlannerVisitTemplate(models.Model):
             date += relativedelta(years=value)
         return date
 
-    def _get_recurrence_dates(self, items):
-        dates = []
-        max_date = self._get_max_date()
-        from_date = self._increase_date(self.last_visit_date or self.start_date, 1)
-        if max_date > from_date:
-            for _x in range(items):
-                if from_date <= max_date:
-                    dates.append(from_date)
-                    from_date = self._increase_date(from_date, 1)
-        return dates
-
-    def _create_visits(self, days=7):
-        return self._prepare_crm_salesperson_planner_visit_vals(
-            self._get_recurrence_dates(days)
+    def _get_recurrence_dates(self, items, cache=None):
+        """Return the next items dates of the template recurrence after the
+        last one already generated, see _get_rrule() for ``cache``."""
+        if not self.start_date or items <= 0:
+            return []
+        cache = {} if cache is None else cache
+        last_date = self.last_occurrence_date or self.last_visit_date or self.start_date
+        key = ("dates",) + self._get_rrule_key() + (last_date, items)
+        if key not in cache:
+            cache[key] = [
+                occurrence.date()
+                for occurrence in self._get_rrule(cache).xafter(
+                    datetime.combine(last_date, time.min), count=items
+                )
+            ]
+        return list(cache[key])
+
+    def _spill_dates(self, dates, load_map):
+        """Move the dates on which the salesperson is fully booked to the next
+        day with a free slot, booking them in load_map."""
+        capacity = self.user_id.salesperson_planner_daily_capacity
+        if not capacity:
+            return dates
+        user_id = self.user_id.id
+        spilled_dates = []
+        for date in dates:
+            while load_map[(user_id, date)] >= capacity:
+                date += timedelta(days=1)
+            load_map[(user_id, date)] += 1
+            spilled_dates.append(date)
+        return spilled_dates
+
+    def _get_visits_vals(self, days=7, load_map=None, cache=None):
+        """Return the values of the next visits of the template and the last
+        recurrence date they come from."""
+        dates = self._get_recurrence_dates(days, cache=cache)
+        if not dates:
+            return [], False
+        last_occurrence = dates[-1]
+        if self.user_id.salesperson_planner_daily_capacity:
+            if load_map is None:
+                load_map = self.env["crm.salesperson.planner.visit.load"]._get_load_map(
+                    self.user_id, min(dates)
+                )
+            dates = self._spill_dates(dates, load_map)
+        return self._prepare_crm_salesperson_planner_visit_vals(dates), last_occurrence
+
+    def _create_visits(self, days=7, load_map=None):
+        vals_list, last_occurrence = self._get_visits_vals(days, load_map=load_map)
+        if last_occurrence:
+            self.write({"last_occurrence_date": last_occurrence})
+        return vals_list
+
+    def _get_load_map(self):
+        """Return the load of the salespersons of the templates with a daily
+        capacity, from the first date the templates may generate."""
+        templates = self.filtered(
+            lambda a: a.start_date and a.user_id.salesperson_planner_daily_capacity
+        )
+        if not templates:
+            return None
+        return self.env["crm.salesperson.planner.visit.load"]._get_load_map(
+            templates.user_id,
+            min(
+                a.last_occurrence_date or a.last_visit_date or a.start_date
+                for a in templates
+            ),
         )
 
     def create_visits(self, days=7):
-        for item in self:
-            visits = self.env["crm.salesperson.planner.visit"].create(
-                item._create_visits(days)
+        load_map = self._get_load_map()
+        cache = {}
+        vals_list = []
+        ids_by_occurrence = defaultdict(list)
+        done_ids = []
+        for item in self.filtered("start_date"):
+            item_vals_list, last_occurrence = item._get_visits_vals(
+                days, load_map=load_map, cache=cache
+            )
+            vals_list += item_vals_list
+            if last_occurrence:
+                ids_by_occurrence[last_occurrence].append(item.id)
+            # the templates in progress before last_occurrence_date existed
+            # only have their last visit date
+            last_occurrence = (
+                last_occurrence or item.last_occurrence_date or item.last_visit_date
+            )
+            if (
+                last_occurrence
+                and item._get_rrule(cache).after(
+                    datetime.combine(last_occurrence, time.max)
+                )
+                is None
+            ):
+                done_ids.append(item.id)
+        for last_occurrence, ids in ids_by_occurrence.items():
+            self.browse(ids).write({"last_occurrence_date": last_occurrence})
+        visits = self.env["crm.salesperson.planner.visit"].create(vals_list)
+        visits_to_confirm = visits.filtered(lambda a: a.visit_template_id.auto_validate)
+        if visits_to_confirm:
+            visits_to_confirm.action_confirm()
+        self.browse(done_ids).write({"state": "done"})
+        return visits
+
+    def _cron_create_visits(self, days=7, batch_size=500):
+        """Create the visits of the templates in progress by chunks of
+        batch_size templates, committing after each chunk. The last template
+        processed is kept in a system parameter, so that a run interrupted by
+        the cron time limit resumes after it instead of creating the visits
+        of the first templates again."""
+        params = self.env["ir.config_parameter"].sudo()
+        today = str(fields.Date.context_today(self))
+        run_date, __, last_id = params.get_param(CRON_CURSOR_PARAM, "").partition(",")
+        last_id = int(last_id) if run_date == today and last_id else 0
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        while True:
+            templates = self.search(
+                [("state", "=", "in-progress"), ("id", ">", last_id)],
+                order="id",
+                limit=batch_size,
             )
-            if visits and item.auto_validate:
-                visits.action_confirm()
-            if item.last_visit_date >= item._get_max_date():
-                item.state = "done"
-
-    def _cron_create_visits(self, days=7):
-        templates = self.search([("state", "=", "in-progress")])
-        templates.create_visits(days)
+            if not templates:
+                break
+            templates.create_visits(days)
+            last_id = templates[-1].id
+            params.set_param(CRON_CURSOR_PARAM, "%s,%s" % (today, last_id))
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+            self.env.invalidate_all()
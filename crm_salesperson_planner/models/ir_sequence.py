@@ -0,0 +1,41 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import api, models
+
+
+class IrSequence(models.Model):
+    _inherit = "ir.sequence"
+
+    @api.model
+    def _next_by_code_batch(self, sequence_code, count):
+        """Return ``count`` successive values of the sequence of the given
+        code, reserving their numbers with one query when the sequence has
+        no date ranges."""
+        if count <= 0:
+            return []
+        self.check_access_rights("read")
+        sequence = self.search(
+            [
+                ("code", "=", sequence_code),
+                ("company_id", "in", [self.env.company.id, False]),
+            ],
+            order="company_id",
+            limit=1,
+        )
+        if not sequence:
+            return [False] * count
+        if sequence.use_date_range or count == 1:
+            return [sequence._next() for _index in range(count)]
+        if sequence.implementation == "standard":
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ["ir_sequence_%03d" % sequence.id, count],
+            )
+            numbers = sorted(row[0] for row in self.env.cr.fetchall())
+        else:
+            first = sequence._update_nogap(sequence.number_increment * count)
+            numbers = [
+                first + index * sequence.number_increment for index in range(count)
+            ]
+        return [sequence.get_next_char(number) for number in numbers]
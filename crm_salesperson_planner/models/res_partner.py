@@ -13,16 +13,10 @@ class ResPartner(models.Model):
     )
 
     def _compute_salesperson_planner_visit_count(self):
-        partners = self | self.mapped("child_ids")
-        partner_data = self.env["crm.salesperson.planner.visit"].read_group(
-            [("partner_id", "in", partners.ids)], ["partner_id"], ["partner_id"]
-        )
-        mapped_data = {m["partner_id"][0]: m["partner_id_count"] for m in partner_data}
+        """Count the visits of the whole hierarchy of each partner."""
+        visit_data = self._get_hierarchy_counts("crm.salesperson.planner.visit")
         for partner in self:
-            visit_count = mapped_data.get(partner.id, 0)
-            for child in partner.child_ids:
-                visit_count += mapped_data.get(child.id, 0)
-            partner.salesperson_planner_visit_count = visit_count
+            partner.salesperson_planner_visit_count = visit_data.get(partner.id, 0)
 
     def action_view_salesperson_planner_visit(self):
         action = self.env["ir.actions.act_window"]._for_xml_id(
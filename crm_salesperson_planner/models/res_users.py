@@ -0,0 +1,15 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import fields, models
+
+
+class ResUsers(models.Model):
+    _inherit = "res.users"
+
+    salesperson_planner_daily_capacity = fields.Integer(
+        string="Daily Visit Capacity",
+        help="Maximum number of visits per day for this salesperson. The visits "
+        "generated from the templates beyond it are moved to the next free day. "
+        "Leave it to 0 for no limit.",
+    )
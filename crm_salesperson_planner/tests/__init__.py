@@ -3,3 +3,4 @@
 
 from . import test_crm_salesperson_planner_visit
 from . import test_crm_salesperson_planner_visit_template
+from . import test_crm_salesperson_planner_sync
@@ -0,0 +1,157 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import common, tagged
+
+
+class TestCrmSalespersonPlannerSyncBase(common.TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = cls.env.ref("base.user_admin")
+        cls.other_user = cls.env["res.users"].create(
+            {"name": "Sync Salesperson", "login": "sync_salesperson"}
+        )
+        cls.partner = cls.env["res.partner"].create({"name": "Sync Partner"})
+        cls.other_partner = cls.env["res.partner"].create({"name": "Sync Partner 2"})
+        cls.opportunity = cls.env["crm.lead"].create(
+            {
+                "name": "Sync Opportunity",
+                "type": "opportunity",
+                "partner_id": cls.partner.id,
+                "user_id": cls.user.id,
+            }
+        )
+        cls.visit_model = cls.env["crm.salesperson.planner.visit"]
+        cls.visit = cls.visit_model.create(
+            {
+                "partner_id": cls.partner.id,
+                "user_id": cls.user.id,
+                "opportunity_ids": [(6, 0, cls.opportunity.ids)],
+            }
+        )
+        cls.other_visit = cls.visit_model.create(
+            {"partner_id": cls.other_partner.id, "user_id": cls.user.id}
+        )
+
+    def _get_sync_data(self, since=None):
+        return self.visit_model.with_user(self.user)._get_sync_data(since)
+
+    def _age(self, records, days=1):
+        """Move the last change of the records a few days back."""
+        records.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE %s SET write_date = write_date - %%s WHERE id IN %%s"
+            % records._table,
+            (timedelta(days=days), tuple(records.ids)),
+        )
+        records.invalidate_recordset(["write_date"])
+
+
+class TestCrmSalespersonPlannerSync(TestCrmSalespersonPlannerSyncBase):
+    def test_full_sync(self):
+        data = self._get_sync_data()
+        visit_ids = [row["id"] for row in data["visits"]]
+        self.assertIn(self.visit.id, visit_ids)
+        self.assertIn(self.other_visit.id, visit_ids)
+        row = data["visits"][visit_ids.index(self.visit.id)]
+        self.assertEqual(row["partner_id"], self.partner.id)
+        self.assertEqual(row["opportunity_ids"], self.opportunity.ids)
+        self.assertNotIn("close_reason_image", row)
+        self.assertIn(self.partner.id, [row["id"] for row in data["partners"]])
+        self.assertEqual(
+            [row["id"] for row in data["opportunities"]], self.opportunity.ids
+        )
+        self.assertEqual(data["cursor"], self.visit.write_date)
+        self.assertEqual(data["deleted"], {"visits": [], "opportunities": []})
+
+    def test_delta_sync(self):
+        self._age(self.visit | self.other_visit)
+        self._age(self.partner | self.other_partner)
+        self._age(self.opportunity)
+        since = fields.Datetime.now() - timedelta(hours=1)
+        data = self._get_sync_data(since)
+        self.assertEqual(data["visits"], [])
+        self.assertEqual(data["partners"], [])
+        self.assertEqual(data["opportunities"], [])
+        self.assertEqual(data["cursor"], since)
+        self.other_visit.write({"sequence": 5})
+        self.opportunity.write({"probability": 50})
+        data = self._get_sync_data(since)
+        self.assertEqual([row["id"] for row in data["visits"]], self.other_visit.ids)
+        self.assertEqual(
+            [row["id"] for row in data["partners"]], self.other_partner.ids
+        )
+        self.assertEqual(
+            [row["id"] for row in data["opportunities"]], self.opportunity.ids
+        )
+        self.assertEqual(data["cursor"], self.other_visit.write_date)
+
+    def test_delta_sync_tombstones(self):
+        since = fields.Datetime.now() - timedelta(hours=1)
+        opportunity_id = self.opportunity.id
+        visit_id = self.visit.id
+        self.opportunity.unlink()
+        self.visit.unlink()
+        self.other_visit.write({"user_id": self.other_user.id})
+        data = self._get_sync_data(since)
+        self.assertEqual(
+            data["deleted"],
+            {
+                "visits": sorted([visit_id, self.other_visit.id]),
+                "opportunities": [opportunity_id],
+            },
+        )
+        self.assertEqual(data["visits"], [])
+        other_data = self.visit_model.with_user(self.other_user)._get_sync_data(since)
+        self.assertEqual(other_data["deleted"]["visits"], [])
+        self.assertEqual(other_data["deleted"]["opportunities"], [opportunity_id])
+        # the visit comes back to the salesperson
+        self.other_visit.write({"user_id": self.user.id})
+        data = self._get_sync_data(since)
+        self.assertEqual(data["deleted"]["visits"], [visit_id])
+
+    def test_purge_tombstones(self):
+        Tombstone = self.env["crm.salesperson.planner.sync.tombstone"]
+        visit_id = self.visit.id
+        self.visit.unlink()
+        tombstone = Tombstone.search(
+            [("res_model", "=", self.visit_model._name), ("res_id", "=", visit_id)]
+        )
+        self.assertTrue(tombstone)
+        Tombstone._cron_purge()
+        self.assertTrue(tombstone.exists())
+        tombstone.date -= timedelta(days=31)
+        Tombstone._cron_purge()
+        self.assertFalse(tombstone.exists())
+
+
+@tagged("post_install", "-at_install")
+class TestCrmSalespersonPlannerSyncController(common.HttpCase):
+    def test_sync_etag(self):
+        partner = self.env["res.partner"].create({"name": "Sync Partner"})
+        self.env["crm.salesperson.planner.visit"].create(
+            {"partner_id": partner.id, "user_id": self.env.ref("base.user_admin").id}
+        )
+        self.authenticate("admin", "admin")
+        response = self.url_open("/crm_salesperson_planner/sync")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertIn(partner.id, [row["id"] for row in data["partners"]])
+        self.assertFalse(data["reset"])
+        etag = response.headers["ETag"]
+        response = self.url_open(
+            "/crm_salesperson_planner/sync", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.url_open(
+            "/crm_salesperson_planner/sync?since=%s" % data["cursor"]
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.url_open("/crm_salesperson_planner/sync?since=2000-01-01")
+        self.assertTrue(response.json()["reset"])
+        response = self.url_open("/crm_salesperson_planner/sync?since=yesterday")
+        self.assertEqual(response.status_code, 400)
@@ -1,12 +1,14 @@
 # Copyright 2021 Sygel - Valentin Vinagre
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
+import base64
 from datetime import datetime, timedelta
 
 from dateutil.relativedelta import relativedelta
+from PIL import Image
 
-from odoo import _, fields
-from odoo.exceptions import ValidationError
+from odoo import _, fields, tools
+from odoo.exceptions import AccessError, ValidationError
 from odoo.tests import common
 
 
@@ -145,6 +147,41 @@ class TestCrmSalespersonPlannerVisit(TestCrmSalespersonPlannerVisitBase):
         self.assertEqual(self.visit1.close_reason_id.id, self.cancel_img.id)
         self.assertEqual(self.visit1.close_reason_image, detail_image)
 
+    def test_close_reason_image_processing(self):
+        image = base64.b64encode(
+            tools.image_apply_opt(Image.new("RGB", (2048, 1024), "red"), "PNG")
+        )
+        self.visit1.action_confirm()
+        self.visit2.action_confirm()
+        self.config_close_wiz(
+            "close", {"reason_id": self.cancel_img.id, "image": image}
+        )
+        self.assertEqual(self.visit1.close_reason_image, image)
+        self.assertTrue(self.visit1.close_reason_image_pending)
+        self.assertFalse(self.visit1.close_reason_image_1024)
+        self.visit_model._cron_process_close_reason_images()
+        self.assertFalse(self.visit1.close_reason_image_pending)
+        self.assertEqual(
+            tools.base64_to_image(self.visit1.close_reason_image_1024).size,
+            (1024, 512),
+        )
+        self.assertEqual(
+            tools.base64_to_image(self.visit1.close_reason_image_128).size, (128, 64)
+        )
+        # the uploaded photo is kept as is
+        self.assertEqual(self.visit1.close_reason_image, image)
+        # the same photo sent again shares the files of the first visit
+        self.visit2.action_cancel(self.cancel_img, image)
+        self.visit2._process_close_reason_images()
+        self.assertFalse(self.visit2.close_reason_image_pending)
+        self.assertEqual(
+            self.visit2.close_reason_image_1024, self.visit1.close_reason_image_1024
+        )
+        storage = self.visit_model._get_close_reason_image_storage()
+        self.assertEqual(storage["attachments"], 6)
+        self.assertEqual(storage["files"], 3)
+        self.assertLess(storage["file_size"], storage["size"])
+
     def test_crm_salesperson_close_wiz_incident(self):
         self.visit1.action_confirm()
         self.assertEqual(self.visit1.state, "confirm")
@@ -203,6 +240,64 @@ class TestCrmSalespersonPlannerVisit(TestCrmSalespersonPlannerVisitBase):
         with self.assertRaises(ValidationError):
             visit.action_done()
 
+    def test_crm_salesperson_close_wiz_multi_cancel_resch(self):
+        visits = self.visit1 | self.visit2
+        visits.action_confirm()
+        events = visits.mapped("calendar_event_id")
+        new_date = self.visit1.date + relativedelta(days=10)
+        close_wiz = self.close_wiz_model.with_context(
+            active_model=self.visit_model._name,
+            active_ids=visits.ids,
+            active_id=self.visit1.id,
+            att_close_type="close",
+        ).create(
+            {"reason_id": self.cancel_resch.id, "new_date": new_date, "notes": "Storm"}
+        )
+        close_wiz.action_close_reason_apply()
+        self.assertEqual(set(visits.mapped("state")), {"cancel"})
+        self.assertEqual(visits.mapped("close_reason_id"), self.cancel_resch)
+        self.assertEqual(visits.mapped("close_reason_notes"), ["Storm", "Storm"])
+        self.assertFalse(events.exists())
+        new_visits = self.visit_model.search(
+            [("date", "=", new_date), ("state", "=", "confirm")]
+        )
+        self.assertEqual(
+            sorted(new_visits.mapped("partner_id").ids),
+            sorted(visits.mapped("partner_id").ids),
+        )
+        self.assertEqual(
+            sorted(new_visits.mapped("sequence")), sorted(visits.mapped("sequence"))
+        )
+        self.assertTrue(all(new_visits.mapped("calendar_event_id")))
+
+    def test_crm_salesperson_close_wiz_multi_resch_date(self):
+        visits = self.visit1 | self.visit2
+        visits.action_confirm()
+        close_wiz = self.close_wiz_model.with_context(
+            active_model=self.visit_model._name,
+            active_ids=visits.ids,
+            active_id=self.visit1.id,
+        ).create({"reason_id": self.cancel_resch.id})
+        # the date of the first visit is not given to all of them
+        self.assertFalse(close_wiz.new_date)
+        with self.assertRaises(ValidationError):
+            close_wiz.action_close_reason_apply()
+        close_wiz = self.close_wiz_model.with_context(
+            active_model="res.partner",
+            active_ids=self.partner1.ids,
+            active_id=self.partner1.id,
+        ).create({"reason_id": self.cancel_resch.id})
+        self.assertFalse(close_wiz._get_visits())
+
+    def test_visit_count_hierarchy(self):
+        sub_contact = self.partner_model.create(
+            {"name": "Partner Sub Contact", "parent_id": self.partner1_contact1.id}
+        )
+        self.visit_model.create({"partner_id": sub_contact.id})
+        partners = self.partner1 | self.partner1_contact1 | sub_contact
+        partners.invalidate_recordset(["salesperson_planner_visit_count"])
+        self.assertEqual(partners.mapped("salesperson_planner_visit_count"), [3, 2, 1])
+
 
 class TestResPartner(common.TransactionCase):
     def test_action_view_salesperson_planner_visit(self):
@@ -338,3 +433,88 @@ class TestCrmSalespersonPlannerVisitTemplateCreate(common.TransactionCase):
 
         expected_date = template.last_visit_date + timedelta(days=7)
         self.assertEqual(default_date_to, expected_date)
+
+
+class TestCrmSalespersonPlannerVisitConfirm(TestCrmSalespersonPlannerVisitBase):
+    def test_action_confirm_bulk(self):
+        partners = self.partner_model.create(
+            [{"name": "Partner Bulk Visit %s" % i} for i in range(20)]
+        )
+        visits = self.visit_model.create(
+            [
+                {"partner_id": partner.id, "date": fields.Date.today() + timedelta(i)}
+                for i, partner in enumerate(partners)
+            ]
+        )
+        visits.action_confirm()
+        self.assertEqual(set(visits.mapped("state")), {"confirm"})
+        for visit in visits:
+            event = visit.calendar_event_id
+            self.assertTrue(event)
+            self.assertEqual(event.res_id, visit.id)
+            self.assertEqual(event.start_date, visit.date)
+            self.assertEqual(event.salesperson_planner_visit_ids, visit)
+            self.assertIn(visit.partner_id, event.partner_ids)
+        self.assertEqual(len(visits.calendar_event_id), 20)
+        self.assertFalse(visits.calendar_event_id.activity_ids)
+
+    def test_write_visits_updates_events(self):
+        visits = self.visit1 | self.visit2
+        visits.action_confirm()
+        new_user = self.env.ref("base.user_demo")
+        new_date = fields.Date.today() + timedelta(days=3)
+        visits.write({"date": new_date, "user_id": new_user.id})
+        for visit in visits:
+            event = visit.calendar_event_id
+            self.assertEqual(event.start_date, new_date)
+            self.assertEqual(event.user_id, new_user)
+            self.assertEqual(event.partner_ids, visit.partner_id | new_user.partner_id)
+
+    def test_write_events_updates_visits(self):
+        visits = self.visit1 | self.visit2
+        visits.action_confirm()
+        new_user = self.env.ref("base.user_demo")
+        events = visits.mapped("calendar_event_id")
+        events.write(
+            {
+                "start": fields.Datetime.today() + timedelta(days=5),
+                "stop": fields.Datetime.today() + timedelta(days=5),
+                "user_id": new_user.id,
+            }
+        )
+        self.assertEqual(
+            visits.mapped("date"), [fields.Date.today() + timedelta(days=5)] * 2
+        )
+        self.assertEqual(visits.mapped("user_id"), new_user)
+        for visit in visits:
+            self.assertEqual(
+                visit.calendar_event_id.partner_ids,
+                visit.partner_id | new_user.partner_id,
+            )
+
+    def test_unlink_events_of_visits(self):
+        visits = self.visit1 | self.visit2
+        visits.action_confirm()
+        events = visits.calendar_event_id
+        other_event = self.env["calendar.event"].create({"name": "Other Event"})
+        with self.assertRaises(ValidationError) as context:
+            (events | other_event).unlink()
+        self.assertEqual(str(context.exception).count("Cancel it"), 2)
+        salesman = self.env["res.users"].create(
+            {
+                "name": "Salesman",
+                "login": "salesperson_planner_salesman",
+                "groups_id": [
+                    (6, 0, self.env.ref("sales_team.group_sale_salesman").ids)
+                ],
+            }
+        )
+        with self.assertRaises(AccessError):
+            events.with_user(salesman).action_cancel_visits_and_unlink()
+        self.visit2.action_done()
+        (events | other_event).action_cancel_visits_and_unlink()
+        self.assertFalse(events.exists())
+        self.assertFalse(other_event.exists())
+        self.assertEqual(self.visit1.state, "cancel")
+        self.assertEqual(self.visit2.state, "done")
+        self.assertFalse(visits.calendar_event_id)
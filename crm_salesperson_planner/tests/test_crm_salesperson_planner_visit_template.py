@@ -2,11 +2,13 @@
 # Copyright 2021 Sygel - Manuel Regidor
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
-from datetime import timedelta
+from datetime import date, timedelta
 
 from odoo import exceptions, fields
 from odoo.tests import common
 
+from ..models.crm_salesperson_planner_visit_template import CRON_CURSOR_PARAM
+
 
 class TestCrmSalespersonPlannerVisitTemplate(common.TransactionCase):
     @classmethod
@@ -183,3 +185,299 @@ class TestCrmSalespersonPlannerVisitTemplate(common.TransactionCase):
         self.assertFalse(first_visit.calendar_event_id)
         first_visit.unlink()
         self.assertEqual(len(visit_template.visit_ids), 9)
+
+    def test_05_cron_create_visits_batch(self):
+        templates = self.visit_template_base
+        for _i in range(4):
+            templates |= self.visit_template_base.copy()
+        templates.write(
+            {
+                "auto_validate": True,
+                "interval": 1,
+                "rrule_type": "daily",
+                "end_type": "count",
+                "count": 10,
+            }
+        )
+        templates.action_validate()
+        # the cron was interrupted after the first two templates
+        self.env["ir.config_parameter"].set_param(
+            CRON_CURSOR_PARAM,
+            "%s,%s" % (fields.Date.context_today(templates), templates[1].id),
+        )
+        self.visit_template_model._cron_create_visits(days=3, batch_size=2)
+        self.assertEqual(templates[:2].mapped("visit_ids_count"), [0, 0])
+        self.assertEqual(templates[2:].mapped("visit_ids_count"), [3, 3, 3])
+        self.assertTrue(all(templates[2:].visit_ids.mapped("calendar_event_id")))
+        self.assertEqual(set(templates[2:].visit_ids.mapped("state")), {"confirm"})
+        # running it again the same day does not create the visits twice
+        self.visit_template_model._cron_create_visits(days=3, batch_size=2)
+        templates.invalidate_recordset(["visit_ids_count"])
+        self.assertEqual(templates[2:].mapped("visit_ids_count"), [3, 3, 3])
+
+    def _create_recurrence_template(self, vals):
+        start = date(2024, 1, 1)
+        template = self.visit_template_model.create(
+            {
+                "partner_ids": [(6, False, self.partner1.ids)],
+                "start_date": start,
+                "stop_date": start,
+                "start": start,
+                "stop": start,
+                "auto_validate": False,
+            }
+        )
+        template.write(vals)
+        return template
+
+    def test_06_recurrence_weekly_weekdays(self):
+        template = self._create_recurrence_template(
+            {
+                "interval": 2,
+                "rrule_type": "weekly",
+                "mon": True,
+                "thu": True,
+                "end_type": "count",
+                "count": 5,
+            }
+        )
+        # the start date is not a visit date, the 5 visits follow it
+        self.assertEqual(
+            template._get_recurrence_dates(3),
+            [date(2024, 1, 4), date(2024, 1, 15), date(2024, 1, 18)],
+        )
+        template.action_validate()
+        template.create_visits(days=3)
+        self.assertEqual(template.last_visit_date, date(2024, 1, 18))
+        self.assertEqual(
+            template._get_recurrence_dates(10),
+            [date(2024, 1, 29), date(2024, 2, 1)],
+        )
+        self.assertEqual(template._get_max_date(), date(2024, 2, 1))
+        template.create_visits(days=10)
+        self.assertEqual(template.state, "done")
+
+    def test_07_recurrence_monthly_by_day(self):
+        template = self._create_recurrence_template(
+            {
+                "interval": 1,
+                "rrule_type": "monthly",
+                "month_by": "day",
+                "byday": "-1",
+                "weekday": "FRI",
+                "end_type": "end_date",
+                "final_date": date(2024, 4, 30),
+            }
+        )
+        self.assertEqual(
+            template._get_recurrence_dates(10),
+            [
+                date(2024, 1, 26),
+                date(2024, 2, 23),
+                date(2024, 3, 29),
+                date(2024, 4, 26),
+            ],
+        )
+        self.assertEqual(template._get_max_date(), date(2024, 4, 26))
+
+    def test_08_recurrence_monthly_by_date_forever(self):
+        template = self._create_recurrence_template(
+            {
+                "interval": 3,
+                "rrule_type": "monthly",
+                "month_by": "date",
+                "day": 15,
+                "end_type": "forever",
+            }
+        )
+        self.assertEqual(
+            template._get_recurrence_dates(3),
+            [date(2024, 1, 15), date(2024, 4, 15), date(2024, 7, 15)],
+        )
+        self.assertFalse(template._get_max_date())
+
+    def test_09_last_visit_date(self):
+        template = self._create_recurrence_template(
+            {"interval": 1, "rrule_type": "daily", "end_type": "count", "count": 5}
+        )
+        template.action_validate()
+        visits = template.create_visits(days=5)
+        self.assertEqual(template.last_visit_date, date(2024, 1, 6))
+        last_visit = visits.filtered(lambda a: a.date == date(2024, 1, 6))
+        last_visit.date = date(2023, 12, 31)
+        self.assertEqual(template.last_visit_date, date(2024, 1, 5))
+        (visits - last_visit).unlink()
+        self.assertEqual(template.last_visit_date, date(2023, 12, 31))
+        last_visit.unlink()
+        self.assertFalse(template.last_visit_date)
+
+    def _get_load(self, day):
+        return self.env["crm.salesperson.planner.visit.load"].search(
+            [("user_id", "=", self.env.user.id), ("date", "=", day)]
+        )
+
+    def test_10_capacity_spill(self):
+        self.env.user.salesperson_planner_daily_capacity = 1
+        booked = self.env["crm.salesperson.planner.visit"].create(
+            {"partner_id": self.partner1.id, "date": date(2024, 1, 1)}
+        )
+        self.assertEqual(self._get_load(date(2024, 1, 1)).visit_count, 1)
+        template = self._create_recurrence_template(
+            {"interval": 1, "rrule_type": "daily", "end_type": "count", "count": 3}
+        )
+        template.action_validate()
+        visits = template.create_visits(days=3)
+        self.assertEqual(
+            sorted(visits.mapped("date")),
+            [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)],
+        )
+        for day in (1, 2, 3, 4):
+            self.assertEqual(self._get_load(date(2024, 1, day)).visit_count, 1)
+        self.assertFalse(visits.filtered("overbooked"))
+        # moving a visit to a full day overbooks it
+        visits[0].date = date(2024, 1, 1)
+        self.assertEqual(self._get_load(date(2024, 1, 1)).visit_count, 2)
+        self.assertTrue(booked.overbooked)
+        self.assertEqual(
+            self.env["crm.salesperson.planner.visit.load"].search(
+                [("overbooked", "=", True)]
+            ),
+            self._get_load(date(2024, 1, 1)),
+        )
+        # cancelled visits free their slot
+        booked.action_cancel(self.close_reason)
+        self.assertEqual(self._get_load(date(2024, 1, 1)).visit_count, 1)
+        booked.unlink()
+        self.assertEqual(self._get_load(date(2024, 1, 1)).visit_count, 1)
+
+    def test_11_bulk_create(self):
+        partners = self.partner_model.create(
+            [{"name": "Bulk Partner %s" % index} for index in range(20)]
+        )
+        attendees = self.env["calendar.attendee"].search_count([])
+        templates = self.visit_template_model._create_bulk(
+            [
+                {
+                    "partner_ids": [(6, 0, partner.ids)],
+                    "start_date": date(2024, 1, 1),
+                    "stop_date": date(2024, 1, 1),
+                    "start": date(2024, 1, 1),
+                    "stop": date(2024, 1, 1),
+                    "rrule_type": "weekly",
+                    "end_type": "count",
+                    "count": 4,
+                }
+                for partner in partners
+            ]
+        )
+        names = templates.mapped("name")
+        self.assertEqual(len(set(names)), 20)
+        self.assertTrue(all(name.startswith("SPPVT/") for name in names))
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(self.env["calendar.attendee"].search_count([]), attendees)
+        self.assertFalse(templates.message_ids)
+        self.assertEqual(set(templates.mapped("rrule_type")), {"weekly"})
+        self.assertEqual(set(templates.mapped("count")), {4})
+        self.assertFalse(templates.message_follower_ids)
+        with self.assertRaises(exceptions.ValidationError):
+            self.visit_template_model._create_bulk(
+                [{"partner_ids": [(6, 0, partners[:2].ids)]}]
+            )
+        # an import keeps the calendar event side effects
+        template = self.visit_template_model.with_context(import_file=True).create(
+            {
+                "partner_ids": [(6, 0, partners[:1].ids)],
+                "start_date": date(2024, 1, 1),
+                "stop_date": date(2024, 1, 1),
+                "start": date(2024, 1, 1),
+                "stop": date(2024, 1, 1),
+            }
+        )
+        self.assertTrue(template.attendee_ids)
+        self.assertTrue(template.message_follower_ids)
+
+    def test_12_sequence_batch(self):
+        sequence = self.env["ir.sequence"].create(
+            {
+                "name": "Batch",
+                "code": "crm.salesperson.planner.test",
+                "prefix": "B/",
+                "padding": 3,
+                "implementation": "no_gap",
+            }
+        )
+        IrSequence = self.env["ir.sequence"]
+        self.assertEqual(
+            IrSequence._next_by_code_batch("crm.salesperson.planner.test", 3),
+            ["B/001", "B/002", "B/003"],
+        )
+        sequence.implementation = "standard"
+        self.assertEqual(
+            IrSequence._next_by_code_batch("crm.salesperson.planner.test", 2),
+            ["B/004", "B/005"],
+        )
+        self.assertEqual(
+            IrSequence.next_by_code("crm.salesperson.planner.test"), "B/006"
+        )
+        self.assertEqual(IrSequence._next_by_code_batch("unknown.code", 2), [False] * 2)
+
+    def test_13_rrule_shared_by_templates(self):
+        vals = {"interval": 2, "rrule_type": "weekly", "end_type": "forever"}
+        template = self._create_recurrence_template(dict(vals, tue=True))
+        same = self._create_recurrence_template(dict(vals, tue=True))
+        other = self._create_recurrence_template(dict(vals, tue=True))
+        start = date(2024, 1, 9)
+        other.write(
+            {"start_date": start, "stop_date": start, "start": start, "stop": start}
+        )
+        # the templates of a generation pass share the rule of their
+        # recurrence and start date
+        cache = {}
+        self.assertIs(template._get_rrule(cache), same._get_rrule(cache))
+        self.assertIsNot(template._get_rrule(cache), other._get_rrule(cache))
+        self.assertEqual(
+            template._get_recurrence_dates(2, cache=cache),
+            [date(2024, 1, 2), date(2024, 1, 16)],
+        )
+        self.assertEqual(
+            other._get_recurrence_dates(2, cache=cache),
+            [date(2024, 1, 23), date(2024, 2, 6)],
+        )
+
+    def test_14_capacity_spill_keeps_occurrences(self):
+        self.env.user.salesperson_planner_daily_capacity = 1
+        self.env["crm.salesperson.planner.visit"].create(
+            {"partner_id": self.partner1.id, "date": date(2024, 1, 2)}
+        )
+        template = self._create_recurrence_template(
+            {"interval": 1, "rrule_type": "daily", "end_type": "count", "count": 5}
+        )
+        template.action_validate()
+        visits = template.create_visits(days=2)
+        self.assertEqual(visits.mapped("date"), [date(2024, 1, 3), date(2024, 1, 4)])
+        self.assertEqual(template.last_visit_date, date(2024, 1, 4))
+        self.assertEqual(template.last_occurrence_date, date(2024, 1, 3))
+        # the occurrence of the 4th is not lost behind the spilled visit
+        visits |= template.create_visits(days=3)
+        self.assertEqual(len(visits), 5)
+        self.assertEqual(
+            sorted(visits.mapped("date"))[-3:],
+            [date(2024, 1, 5), date(2024, 1, 6), date(2024, 1, 7)],
+        )
+        self.assertEqual(template.last_occurrence_date, date(2024, 1, 6))
+        self.assertEqual(template.state, "done")
+
+    def test_15_done_without_last_occurrence(self):
+        template = self._create_recurrence_template(
+            {"interval": 1, "rrule_type": "daily", "end_type": "count", "count": 3}
+        )
+        template.action_validate()
+        # a template in progress before last_occurrence_date was stored
+        self.env["crm.salesperson.planner.visit"].create(
+            template._prepare_crm_salesperson_planner_visit_vals(
+                [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)]
+            )
+        )
+        self.assertFalse(template.last_occurrence_date)
+        self.assertFalse(template.create_visits(days=3))
+        self.assertEqual(template.state, "done")
@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
 from odoo import _, fields, models
+from odoo.exceptions import ValidationError
 
 
 class CrmSalespersonPlannerVisitCloseWiz(models.TransientModel):
@@ -9,23 +10,20 @@ class CrmSalespersonPlannerVisitCloseWiz(models.TransientModel):
     _description = "Get Close Reason"
 
     def _default_new_date(self):
-        visits = self.env["crm.salesperson.planner.visit"].browse(
-            self.env.context.get("active_id")
-        )
-        return visits.date
+        # several visits do not share a date to start from
+        visits = self._get_visits()
+        return visits.date if len(visits) == 1 else False
 
     def _default_new_sequence(self):
-        visits = self.env["crm.salesperson.planner.visit"].browse(
-            self.env.context.get("active_id")
-        )
-        return visits.sequence
+        visits = self._get_visits()
+        return visits.sequence if len(visits) == 1 else 0
 
     reason_id = fields.Many2one(
         comodel_name="crm.salesperson.planner.visit.close.reason",
         string="Reason",
         required=True,
     )
-    image = fields.Image(max_width=1024, max_height=1024)
+    image = fields.Image()
     new_date = fields.Date(default=lambda self: self._default_new_date())
     new_sequence = fields.Integer(
         string="Sequence",
@@ -41,23 +39,29 @@ class CrmSalespersonPlannerVisitCloseWiz(models.TransientModel):
     )
     notes = fields.Text()
 
-    def action_close_reason_apply(self):
-        visits = self.env["crm.salesperson.planner.visit"].browse(
-            self.env.context.get("active_id")
+    def _get_visits(self):
+        Visit = self.env["crm.salesperson.planner.visit"]
+        if self.env.context.get("active_model") != Visit._name:
+            return Visit
+        return Visit.browse(
+            self.env.context.get("active_ids") or self.env.context.get("active_id")
         )
+
+    def action_close_reason_apply(self):
+        visits = self._get_visits()
+        if self.allow_reschedule and self.reschedule and not self.new_date:
+            raise ValidationError(
+                _("Set the date on which the visits are rescheduled.")
+            )
         visit_close_find_method_name = "action_%s" % self.reason_id.close_type
         if hasattr(visits, visit_close_find_method_name):
             getattr(visits, visit_close_find_method_name)(
                 self.reason_id, self.image, self.notes
             )
             if self.allow_reschedule and self.reschedule:
-                visits.copy(
-                    {
-                        "date": self.new_date,
-                        "sequence": self.new_sequence,
-                        "opportunity_ids": visits.opportunity_ids.ids,
-                    }
-                ).action_confirm()
+                visits._reschedule(
+                    self.new_date, self.new_sequence if len(visits) == 1 else None
+                )
         else:
             raise ValueError(_("The close reason type haven't a function."))
         return {"type": "ir.actions.act_window_close"}
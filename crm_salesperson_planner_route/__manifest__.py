@@ -0,0 +1,18 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+{
+    "name": "Crm Salesperson Planner Route",
+    "summary": "Order the visits of each salesperson day to shorten the route",
+    "version": "16.0.1.0.0",
+    "development_status": "Beta",
+    "category": "Customer Relationship Management",
+    "author": "Odoo Community Association (OCA)",
+    "website": "https://github.com/OCA/crm",
+    "license": "AGPL-3",
+    "depends": ["crm_salesperson_planner", "base_geolocalize"],
+    "data": [
+        "views/crm_salesperson_planner_visit_views.xml",
+        "data/ir_cron_data.xml",
+    ],
+    "installable": True,
+}
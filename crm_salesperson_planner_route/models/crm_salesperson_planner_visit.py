@@ -0,0 +1,77 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import fields, models
+
+from ..route_solver import solve
+
+ROUTE_STATES = ("draft", "confirm")
+
+
+class CrmSalespersonPlannerVisit(models.Model):
+    _inherit = "crm.salesperson.planner.visit"
+
+    def _get_route_point(self, partner):
+        """(lat, lng) of a geolocalized partner, None otherwise."""
+        if not (partner.partner_latitude or partner.partner_longitude):
+            return None
+        return partner.partner_latitude, partner.partner_longitude
+
+    def _get_route_groups(self):
+        groups = defaultdict(list)
+        for visit in self:
+            if visit.user_id and visit.date and visit.state in ROUTE_STATES:
+                groups[(visit.user_id.id, visit.date)].append(visit.id)
+        return [
+            self.browse(ids).with_prefetch(self._prefetch_ids)
+            for ids in groups.values()
+        ]
+
+    def _get_route_sequences(self):
+        """Return the new sequences of the visits of one salesperson day.
+
+        The geolocalized visits are ordered to shorten the path starting at
+        the salesperson address, the others keep their relative order after
+        them.
+        """
+        visits = self.sorted(lambda a: (a.sequence, a.id))
+        located = []
+        points = []
+        others = []
+        for visit in visits:
+            point = self._get_route_point(visit.partner_id)
+            if point:
+                located.append(visit)
+                points.append(point)
+            else:
+                others.append(visit)
+        depot = self._get_route_point(visits.user_id.partner_id)
+        ordered = [located[index] for index in solve(points, depot)] + others
+        return {visit: sequence for sequence, visit in enumerate(ordered, 1)}
+
+    def action_optimize_route(self):
+        """Reorder the visits of every salesperson day found in the records."""
+        ids_by_sequence = defaultdict(list)
+        for visits in self._get_route_groups():
+            for visit, sequence in visits._get_route_sequences().items():
+                if visit.sequence != sequence:
+                    ids_by_sequence[sequence].append(visit.id)
+        # the positions are shared by all the days, one write per position
+        for sequence, ids in ids_by_sequence.items():
+            self.browse(ids).write({"sequence": sequence})
+        return True
+
+    def _cron_optimize_routes(self, days=1):
+        """Reorder the open visits of the next ``days`` days."""
+        today = fields.Date.context_today(self)
+        visits = self.search(
+            [
+                ("state", "in", ROUTE_STATES),
+                ("date", ">=", today),
+                ("date", "<", today + timedelta(days=days)),
+            ]
+        )
+        return visits.action_optimize_route()
@@ -0,0 +1,97 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+"""Open path solver used to order the visits of a salesperson day.
+
+The path starts at an optional depot (the salesperson address) and does not
+come back to it. It is built with a nearest neighbour heuristic and then
+improved with 2-opt moves over a precomputed distance matrix.
+"""
+
+from math import asin, cos, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine(point_a, point_b):
+    """Great circle distance in kilometers between two (lat, lng) points."""
+    lat_a, lng_a = map(radians, point_a)
+    lat_b, lng_b = map(radians, point_b)
+    value = (
+        sin((lat_b - lat_a) / 2) ** 2
+        + cos(lat_a) * cos(lat_b) * sin((lng_b - lng_a) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(value)))
+
+
+def distance_matrix(points, depot=None):
+    """Square matrix of the distances between the depot and the points.
+
+    Index 0 is the depot. Without depot it is at distance 0 of every point,
+    so that the path can start at any of them.
+    """
+    nodes = [depot] + list(points)
+    size = len(nodes)
+    matrix = [[0.0] * size for _index in range(size)]
+    for i in range(1, size):
+        row = matrix[i]
+        for j in range(i + 1, size):
+            row[j] = matrix[j][i] = haversine(nodes[i], nodes[j])
+        if depot is not None:
+            matrix[0][i] = row[0] = haversine(depot, nodes[i])
+    return matrix
+
+
+def path_length(matrix, path):
+    return sum(matrix[a][b] for a, b in zip(path, path[1:]))
+
+
+def nearest_neighbour(matrix):
+    """Greedy path starting at the depot, visiting the closest node first."""
+    pending = set(range(1, len(matrix)))
+    path = [0]
+    while pending:
+        row = matrix[path[-1]]
+        node = min(pending, key=lambda candidate: (row[candidate], candidate))
+        pending.remove(node)
+        path.append(node)
+    return path
+
+
+def two_opt(matrix, path, max_rounds=50):
+    """Reverse path segments as long as it shortens the open path.
+
+    The depot (first node) stays in place and the path has no fixed end.
+    """
+    path = list(path)
+    last = len(path) - 1
+    for _round in range(max_rounds):
+        improved = False
+        for i in range(1, last):
+            a, b = path[i - 1], path[i]
+            row_a, row_b = matrix[a], matrix[b]
+            base = row_a[b]
+            for j in range(i + 1, last + 1):
+                c = path[j]
+                if j < last:
+                    d = path[j + 1]
+                    delta = row_a[c] + row_b[d] - base - matrix[c][d]
+                else:
+                    delta = row_a[c] - base
+                if delta < -1e-9:
+                    path[i : j + 1] = path[j:i:-1] + [b]
+                    b = path[i]
+                    row_b = matrix[b]
+                    base = row_a[b]
+                    improved = True
+        if not improved:
+            break
+    return path
+
+
+def solve(points, depot=None):
+    """Return the indexes of ``points`` in the order they should be visited."""
+    if len(points) < 2:
+        return list(range(len(points)))
+    matrix = distance_matrix(points, depot)
+    path = two_opt(matrix, nearest_neighbour(matrix))
+    return [node - 1 for node in path[1:]]
@@ -0,0 +1,137 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import common
+
+from ..route_solver import (
+    distance_matrix,
+    nearest_neighbour,
+    path_length,
+    solve,
+    two_opt,
+)
+
+
+class TestCrmSalespersonPlannerRoute(common.TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.visit_model = cls.env["crm.salesperson.planner.visit"]
+        cls.today = fields.Date.context_today(cls.visit_model)
+        cls.user = cls.env.ref("base.user_admin")
+        cls.user.partner_id.write({"partner_latitude": 40.0, "partner_longitude": 0.0})
+        # customers along a meridian, created in a shuffled order
+        cls.partners = cls.env["res.partner"].create(
+            [
+                {
+                    "name": "Route Partner %s" % latitude,
+                    "partner_latitude": 40.0 + latitude / 10,
+                    "partner_longitude": 0.0,
+                }
+                for latitude in (3, 1, 4, 2, 5)
+            ]
+        )
+        cls.partner_unlocated = cls.env["res.partner"].create(
+            {"name": "Route Partner Unlocated"}
+        )
+
+    def _create_visits(self, partners, date=None, user=None):
+        return self.visit_model.create(
+            [
+                {
+                    "partner_id": partner.id,
+                    "user_id": (user or self.user).id,
+                    "date": date or self.today,
+                    "sequence": 10,
+                }
+                for partner in partners
+            ]
+        )
+
+    def _route(self, visits):
+        return visits.sorted(lambda a: (a.sequence, a.id)).mapped("partner_id.name")
+
+    def test_solve(self):
+        points = [(40.3, 0.0), (40.1, 0.0), (40.4, 0.0), (40.2, 0.0)]
+        self.assertEqual(solve(points, (40.0, 0.0)), [1, 3, 0, 2])
+        self.assertEqual(solve(points, (40.5, 0.0)), [2, 0, 3, 1])
+        self.assertIn(solve(points), ([1, 3, 0, 2], [2, 0, 3, 1]))
+        self.assertEqual(solve([(40.3, 0.0)]), [0])
+        self.assertEqual(solve([]), [])
+
+    def test_solve_two_opt(self):
+        # the greedy path leaves the farthest point for the end
+        points = [(0.2, 0.5), (0.4, 0.6), (0.6, 0.1), (0.0, 0.8), (0.3, 0.2)]
+        matrix = distance_matrix(points, (0.0, 0.0))
+        greedy = nearest_neighbour(matrix)
+        self.assertEqual(greedy, [0, 5, 1, 2, 4, 3])
+        self.assertEqual(two_opt(matrix, greedy), [0, 3, 5, 1, 2, 4])
+        self.assertLess(
+            path_length(matrix, two_opt(matrix, greedy)),
+            path_length(matrix, greedy),
+        )
+
+    def test_optimize_route(self):
+        visits = self._create_visits(self.partners | self.partner_unlocated)
+        visits.action_optimize_route()
+        self.assertEqual(
+            self._route(visits),
+            [
+                "Route Partner 1",
+                "Route Partner 2",
+                "Route Partner 3",
+                "Route Partner 4",
+                "Route Partner 5",
+                "Route Partner Unlocated",
+            ],
+        )
+        self.assertEqual(sorted(visits.mapped("sequence")), [1, 2, 3, 4, 5, 6])
+
+    def test_optimize_route_by_day_and_user(self):
+        other_user = self.env["res.users"].create(
+            {
+                "name": "Route Salesperson",
+                "login": "route_salesperson",
+                "partner_latitude": 41.0,
+                "partner_longitude": 0.0,
+            }
+        )
+        today_visits = self._create_visits(self.partners)
+        other_visits = self._create_visits(self.partners, user=other_user)
+        tomorrow_visits = self._create_visits(
+            self.partners, date=self.today + timedelta(days=1)
+        )
+        (today_visits | other_visits | tomorrow_visits).action_optimize_route()
+        route = ["Route Partner %s" % index for index in range(1, 6)]
+        self.assertEqual(self._route(today_visits), route)
+        self.assertEqual(self._route(tomorrow_visits), route)
+        self.assertEqual(self._route(other_visits), route[::-1])
+
+    def test_optimize_route_closed_visits(self):
+        visits = self._create_visits(self.partners)
+        visits[0].write({"state": "done"})
+        visits.action_optimize_route()
+        self.assertEqual(visits[0].sequence, 10)
+        self.assertEqual(
+            self._route(visits[1:]),
+            [
+                "Route Partner 1",
+                "Route Partner 2",
+                "Route Partner 4",
+                "Route Partner 5",
+            ],
+        )
+
+    def test_cron_optimize_routes(self):
+        visits = self._create_visits(self.partners)
+        later_visits = self._create_visits(
+            self.partners, date=self.today + timedelta(days=7)
+        )
+        self.visit_model._cron_optimize_routes(days=7)
+        self.assertEqual(
+            self._route(visits), ["Route Partner %s" % index for index in range(1, 6)]
+        )
+        self.assertEqual(set(later_visits.mapped("sequence")), {10})
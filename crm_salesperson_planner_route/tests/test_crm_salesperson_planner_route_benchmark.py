@@ -0,0 +1,111 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+import logging
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from odoo.tests import common, tagged
+
+from ..route_solver import distance_matrix, nearest_neighbour, path_length, solve
+
+_logger = logging.getLogger(__name__)
+
+# The size of the benchmark can be given through the environment, e.g.
+# ROUTE_BENCH_VISITS=10000 ROUTE_BENCH_DAY_VISITS=12
+# odoo-bin -i crm_salesperson_planner_route --test-tags route_benchmark
+BENCH_VISITS = int(os.environ.get("ROUTE_BENCH_VISITS", 10000))
+BENCH_DAY_VISITS = int(os.environ.get("ROUTE_BENCH_DAY_VISITS", 12))
+BENCH_SECONDS = float(os.environ.get("ROUTE_BENCH_SECONDS", 60))
+
+
+@tagged("post_install", "-at_install", "-standard", "route_benchmark")
+class TestCrmSalespersonPlannerRouteBenchmark(common.TransactionCase):
+    """Solve BENCH_VISITS synthetic visits split in salesperson days."""
+
+    def _synthetic_days(self):
+        generator = random.Random(16)
+        days = []
+        for _day in range(BENCH_VISITS // BENCH_DAY_VISITS):
+            # every salesperson works around its own town
+            lat, lng = generator.uniform(36, 43), generator.uniform(-9, 3)
+            days.append(
+                (
+                    [
+                        (lat + generator.gauss(0, 0.2), lng + generator.gauss(0, 0.2))
+                        for _visit in range(BENCH_DAY_VISITS)
+                    ],
+                    (lat, lng),
+                )
+            )
+        return days
+
+    def test_benchmark_solver(self):
+        days = self._synthetic_days()
+        greedy_length = solved_length = 0.0
+        start = time.perf_counter()
+        for points, depot in days:
+            order = solve(points, depot)
+            self.assertEqual(sorted(order), list(range(len(points))))
+        elapsed = time.perf_counter() - start
+        for points, depot in days:
+            matrix = distance_matrix(points, depot)
+            greedy_length += path_length(matrix, nearest_neighbour(matrix))
+            solved_length += path_length(
+                matrix, [0] + [index + 1 for index in solve(points, depot)]
+            )
+        _logger.info(
+            "Route benchmark: %s visits in %s days solved in %.3fs, "
+            "%.0f km with nearest neighbour, %.0f km with 2-opt",
+            BENCH_VISITS,
+            len(days),
+            elapsed,
+            greedy_length,
+            solved_length,
+        )
+        self.assertLessEqual(solved_length, greedy_length)
+        self.assertLess(elapsed, BENCH_SECONDS)
+
+    def test_benchmark_optimize_route(self):
+        """Seed the days as visits and time the batch optimization."""
+        days = self._synthetic_days()[:50]
+        Partner = self.env["res.partner"].with_context(tracking_disable=True)
+        partners = Partner.create(
+            [
+                {
+                    "name": "Route Benchmark %s-%s" % (day, index),
+                    "partner_latitude": point[0],
+                    "partner_longitude": point[1],
+                }
+                for day, (points, _depot) in enumerate(days)
+                for index, point in enumerate(points)
+            ]
+        )
+        user = self.env.user
+        visits = (
+            self.env["crm.salesperson.planner.visit"]
+            .with_context(tracking_disable=True)
+            .create(
+                [
+                    {
+                        "partner_id": partner.id,
+                        "user_id": user.id,
+                        "date": date(2030, 1, 1)
+                        + timedelta(days=index // BENCH_DAY_VISITS),
+                    }
+                    for index, partner in enumerate(partners)
+                ]
+            )
+        )
+        self.env.invalidate_all()
+        queries = self.cr.sql_log_count
+        start = time.perf_counter()
+        visits.action_optimize_route()
+        _logger.info(
+            "Route benchmark: %s visits ordered in %.3fs and %s queries",
+            len(visits),
+            time.perf_counter() - start,
+            self.cr.sql_log_count - queries,
+        )
@@ -12,6 +12,10 @@
     "data": [
         "views/sale_order_views.xml",
         "views/crm_salesperson_planner_visit_views.xml",
+        "report/crm_salesperson_planner_visit_sale_report_views.xml",
+        "data/ir_cron_data.xml",
+        "security/crm_salesperson_planner_sale_security.xml",
+        "security/ir.model.access.csv",
     ],
     "installable": True,
 }
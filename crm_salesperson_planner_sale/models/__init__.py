@@ -2,4 +2,5 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
 from . import sale_order
+from . import sale_order_line
 from . import crm_salesperson_planner_visit
@@ -1,43 +1,111 @@
 # Copyright 2021 Sygel - Valentin Vinagre
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
+from collections import defaultdict
+
 from odoo import api, fields, models
 
+from .sale_order import QUOTATION_STATES, SALE_COUNT_FIELDS
+
+# visit fields shown in the visits to sales report, their changes queue the
+# visits to refresh
+VISIT_REPORT_FIELDS = (
+    "date",
+    "user_id",
+    "partner_id",
+    "company_id",
+    "close_reason_id",
+    "state",
+)
+
 
 class CrmSalespersonPlannerVisit(models.Model):
     _inherit = "crm.salesperson.planner.visit"
 
     order_ids = fields.One2many("sale.order", "visit_id", string="Orders")
+    # kept up to date by the orders, see sale.order _get_visit_sale_counts()
     sale_order_count = fields.Integer(
-        compute="_compute_sale_data", string="Number of Sale Orders", store=True
+        string="Number of Sale Orders", readonly=True, copy=False
     )
     quotation_count = fields.Integer(
-        compute="_compute_sale_data", string="Number of Quotations", store=True
+        string="Number of Quotations", readonly=True, copy=False
     )
 
-    @api.depends("order_ids.state")
-    def _compute_sale_data(self):
-        quotation_domain = [
-            ("visit_id", "in", self.ids),
-            ("state", "in", ("draft", "sent")),
-        ]
-        quotation_data = self.env["sale.order"].read_group(
-            domain=quotation_domain, fields=["visit_id"], groupby=["visit_id"]
+    def _recompute_sale_data(self):
+        """Count again the orders of the visits, with one query grouping
+        them by visit and state bucket."""
+        if not self:
+            return
+        self.env["sale.order"].flush_model(["visit_id", "state"])
+        self.flush_recordset(SALE_COUNT_FIELDS)
+        self.env.cr.execute(
+            """
+            UPDATE crm_salesperson_planner_visit visit
+            SET quotation_count = counts.quotation_count,
+                sale_order_count = counts.sale_order_count
+            FROM (
+                SELECT selected.id,
+                    count(orders.id) FILTER (
+                        WHERE orders.state IN %s
+                    ) AS quotation_count,
+                    count(orders.id) FILTER (
+                        WHERE orders.state NOT IN %s
+                    ) AS sale_order_count
+                FROM crm_salesperson_planner_visit selected
+                LEFT JOIN sale_order orders
+                    ON orders.visit_id = selected.id AND orders.state != 'cancel'
+                WHERE selected.id IN %s
+                GROUP BY selected.id
+            ) counts
+            WHERE visit.id = counts.id
+            """,
+            [QUOTATION_STATES, QUOTATION_STATES, tuple(self.ids)],
         )
-        sale_domain = [
-            ("visit_id", "in", self.ids),
-            ("state", "not in", ("draft", "sent", "cancel")),
-        ]
-        sale_data = self.env["sale.order"].read_group(
-            domain=sale_domain, fields=["visit_id"], groupby=["visit_id"]
+        self.invalidate_recordset(SALE_COUNT_FIELDS)
+
+    @api.model
+    def _add_sale_counts(self, deltas):
+        """Add the order count deltas given by (visit id, field name) to the
+        visits, with one query."""
+        counts = defaultdict(lambda: dict.fromkeys(SALE_COUNT_FIELDS, 0))
+        for (visit_id, fname), delta in deltas.items():
+            if delta:
+                counts[visit_id][fname] += delta
+        if not counts:
+            return
+        visits = self.browse(counts)
+        visits.flush_recordset(SALE_COUNT_FIELDS)
+        self.env.cr.execute(
+            """
+            UPDATE crm_salesperson_planner_visit visit
+            SET quotation_count = visit.quotation_count + delta.quotation_count,
+                sale_order_count = visit.sale_order_count + delta.sale_order_count
+            FROM unnest(%s::int[], %s::int[], %s::int[])
+                AS delta(id, quotation_count, sale_order_count)
+            WHERE visit.id = delta.id
+            """,
+            [
+                list(counts),
+                [count["quotation_count"] for count in counts.values()],
+                [count["sale_order_count"] for count in counts.values()],
+            ],
         )
-        mapped_quotation_data = {
-            m["visit_id"][0]: m["visit_id_count"] for m in quotation_data
-        }
-        mapped_sale_data = {m["visit_id"][0]: m["visit_id_count"] for m in sale_data}
-        for sel in self:
-            sel.quotation_count = mapped_quotation_data.get(sel.id, 0)
-            sel.sale_order_count = mapped_sale_data.get(sel.id, 0)
+        visits.invalidate_recordset(SALE_COUNT_FIELDS)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        visits = super().create(vals_list)
+        self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(visits.ids)
+        return visits
+
+    def write(self, values):
+        if set(VISIT_REPORT_FIELDS) & set(values):
+            self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(self.ids)
+        return super().write(values)
+
+    def unlink(self):
+        self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(self.ids)
+        return super().unlink()
 
     def _prepare_context_from_action(self):
         return {
@@ -1,7 +1,25 @@
 # Copyright 2021 Sygel - Valentin Vinagre
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
-from odoo import fields, models
+from collections import Counter
+
+from odoo import api, fields, models
+
+QUOTATION_STATES = ("draft", "sent")
+# order fields shown in the visits to sales report, their changes queue the
+# visits to refresh
+ORDER_REPORT_FIELDS = ("visit_id", "state", "amount_untaxed", "currency_rate")
+# order fields the reported ones are computed from, the amounts also follow
+# the lines, see sale.order.line
+ORDER_REPORT_DEPENDS = (
+    "visit_id",
+    "state",
+    "currency_id",
+    "pricelist_id",
+    "date_order",
+    "company_id",
+)
+SALE_COUNT_FIELDS = ["quotation_count", "sale_order_count"]
 
 
 class SaleOrder(models.Model):
@@ -14,3 +32,59 @@ class SaleOrder(models.Model):
         domain="[('partner_id', 'child_of', partner_id),"
         " '|', ('company_id', '=', False), ('company_id', '=', company_id)]",
     )
+
+    def _get_visit_sale_counts(self):
+        """Return the number of orders counted by the visits, per (visit id,
+        counter field name)."""
+        counts = Counter()
+        for order in self:
+            if order.visit_id and order.state != "cancel":
+                fname = (
+                    "quotation_count"
+                    if order.state in QUOTATION_STATES
+                    else "sale_order_count"
+                )
+                counts[(order.visit_id.id, fname)] += 1
+        return counts
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        self.env["crm.salesperson.planner.visit"]._add_sale_counts(
+            orders._get_visit_sale_counts()
+        )
+        self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+            orders.visit_id.ids
+        )
+        return orders
+
+    def write(self, vals):
+        update_counts = {"visit_id", "state"} & set(vals)
+        if update_counts:
+            counts = self._get_visit_sale_counts()
+        if set(ORDER_REPORT_DEPENDS) & set(vals):
+            self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+                self.visit_id.ids
+            )
+        res = super().write(vals)
+        if "visit_id" in vals:
+            self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+                self.visit_id.ids
+            )
+        if update_counts:
+            counts.subtract(self._get_visit_sale_counts())
+            self.env["crm.salesperson.planner.visit"]._add_sale_counts(
+                {key: -count for key, count in counts.items()}
+            )
+        return res
+
+    def unlink(self):
+        counts = self._get_visit_sale_counts()
+        self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+            self.visit_id.ids
+        )
+        res = super().unlink()
+        self.env["crm.salesperson.planner.visit"]._add_sale_counts(
+            {key: -count for key, count in counts.items()}
+        )
+        return res
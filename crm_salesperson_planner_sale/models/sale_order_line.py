@@ -0,0 +1,46 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import api, models
+
+# line fields the order amounts are computed from
+LINE_REPORT_DEPENDS = (
+    "order_id",
+    "product_id",
+    "product_uom",
+    "product_uom_qty",
+    "price_unit",
+    "discount",
+    "tax_id",
+    "display_type",
+)
+
+
+class SaleOrderLine(models.Model):
+    _inherit = "sale.order.line"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+            lines.order_id.visit_id.ids
+        )
+        return lines
+
+    def write(self, vals):
+        if set(LINE_REPORT_DEPENDS) & set(vals):
+            self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+                self.order_id.visit_id.ids
+            )
+        res = super().write(vals)
+        if "order_id" in vals:
+            self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+                self.order_id.visit_id.ids
+            )
+        return res
+
+    def unlink(self):
+        self.env["crm.salesperson.planner.visit.sale.report"]._enqueue(
+            self.order_id.visit_id.ids
+        )
+        return super().unlink()
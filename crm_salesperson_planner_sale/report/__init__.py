@@ -0,0 +1,4 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from . import crm_salesperson_planner_visit_sale_report
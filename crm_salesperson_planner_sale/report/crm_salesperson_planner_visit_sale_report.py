@@ -0,0 +1,218 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import api, fields, models, tools
+
+from ..models.sale_order import ORDER_REPORT_FIELDS, QUOTATION_STATES
+
+
+class CrmSalespersonPlannerVisitSaleReport(models.Model):
+    """Visits with the quotations and orders made from them.
+
+    The rows live in a real table, one per visit, refreshed from the queue
+    of the visits changed directly or through their orders, see
+    _refresh_changed().
+    """
+
+    _name = "crm.salesperson.planner.visit.sale.report"
+    _description = "Salesperson Visits to Sales Analysis"
+    _auto = False
+    _order = "date desc"
+    _rec_name = "visit_id"
+
+    visit_id = fields.Many2one(
+        comodel_name="crm.salesperson.planner.visit", string="Visit", readonly=True
+    )
+    date = fields.Date(readonly=True)
+    user_id = fields.Many2one(
+        comodel_name="res.users", string="Salesperson", readonly=True
+    )
+    partner_id = fields.Many2one(
+        comodel_name="res.partner", string="Customer", readonly=True
+    )
+    company_id = fields.Many2one(
+        comodel_name="res.company", string="Company", readonly=True
+    )
+    close_reason_id = fields.Many2one(
+        comodel_name="crm.salesperson.planner.visit.close.reason",
+        string="Close Reason",
+        readonly=True,
+    )
+    state = fields.Selection(
+        selection=lambda self: self.env["crm.salesperson.planner.visit"]
+        ._fields["state"]
+        ._description_selection(self.env),
+        string="Status",
+        readonly=True,
+    )
+    visit_count = fields.Integer(string="# Visits", readonly=True)
+    done_count = fields.Integer(string="# Visited", readonly=True)
+    cancel_count = fields.Integer(string="# Cancelled", readonly=True)
+    incident_count = fields.Integer(string="# Incidents", readonly=True)
+    quotation_count = fields.Integer(string="# Quotations", readonly=True)
+    sale_order_count = fields.Integer(string="# Sale Orders", readonly=True)
+    amount_untaxed = fields.Float(
+        string="Untaxed Amount Ordered",
+        readonly=True,
+        help="Untaxed amount of the confirmed orders, in company currency",
+    )
+
+    def _select(self):
+        return """
+            SELECT
+                visit.id,
+                visit.id AS visit_id,
+                visit.date,
+                visit.user_id,
+                visit.partner_id,
+                visit.company_id,
+                visit.close_reason_id,
+                visit.state,
+                1 AS visit_count,
+                (visit.state = 'done')::int AS done_count,
+                (visit.state = 'cancel')::int AS cancel_count,
+                (visit.state = 'incident')::int AS incident_count,
+                coalesce(orders.quotation_count, 0) AS quotation_count,
+                coalesce(orders.sale_order_count, 0) AS sale_order_count,
+                coalesce(orders.amount_untaxed, 0) AS amount_untaxed
+        """
+
+    def _from(self):
+        return """
+            FROM crm_salesperson_planner_visit visit
+            LEFT JOIN (
+                SELECT
+                    visit_id,
+                    count(*) FILTER (WHERE state IN %(quotation_states)s)
+                        AS quotation_count,
+                    count(*) FILTER (WHERE state NOT IN %(quotation_states)s)
+                        AS sale_order_count,
+                    sum(
+                        amount_untaxed / CASE coalesce(currency_rate, 0)
+                            WHEN 0 THEN 1.0 ELSE currency_rate END
+                    ) FILTER (WHERE state NOT IN %(quotation_states)s)
+                        AS amount_untaxed
+                FROM sale_order
+                WHERE visit_id IS NOT NULL AND state != 'cancel'
+                    AND (%(all)s OR visit_id = ANY(%(visit_ids)s))
+                GROUP BY visit_id
+            ) orders ON orders.visit_id = visit.id
+            WHERE %(all)s OR visit.id = ANY(%(visit_ids)s)
+        """
+
+    def init(self):
+        self.env.cr.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crm_salesperson_planner_visit_sale_report (
+                id integer PRIMARY KEY,
+                visit_id integer,
+                date date,
+                user_id integer,
+                partner_id integer,
+                company_id integer,
+                close_reason_id integer,
+                state varchar,
+                visit_count integer,
+                done_count integer,
+                cancel_count integer,
+                incident_count integer,
+                quotation_count integer,
+                sale_order_count integer,
+                amount_untaxed numeric
+            );
+            CREATE TABLE IF NOT EXISTS crm_salesperson_planner_visit_sale_report_queue (
+                visit_id integer NOT NULL
+            )
+            """
+        )
+        queue_index = "crm_salesperson_planner_visit_sale_report_queue_visit_id_uniq"
+        if not tools.index_exists(self.env.cr, queue_index):
+            # a visit is queued once, whatever the number of its changes
+            self.env.cr.execute(
+                """
+                DELETE FROM crm_salesperson_planner_visit_sale_report_queue queue
+                USING crm_salesperson_planner_visit_sale_report_queue other
+                WHERE queue.visit_id = other.visit_id AND queue.ctid < other.ctid
+                """
+            )
+            tools.create_unique_index(
+                self.env.cr,
+                queue_index,
+                "crm_salesperson_planner_visit_sale_report_queue",
+                ["visit_id"],
+            )
+        for columns in (["date"], ["user_id", "date"], ["partner_id"], ["state"]):
+            tools.create_index(
+                self.env.cr,
+                "%s_%s_index" % (self._table, "_".join(columns)),
+                self._table,
+                columns,
+            )
+        # nothing to read before the orders get their visit column, the
+        # next update fills the table
+        if not tools.column_exists(self.env.cr, "sale_order", "visit_id"):
+            return
+        self.env.cr.execute(
+            "SELECT 1 FROM crm_salesperson_planner_visit_sale_report LIMIT 1"
+        )
+        if not self.env.cr.fetchone():
+            self._refresh()
+
+    @api.model
+    def _refresh(self, visit_ids=None):
+        """Compute again the rows of the given visits, of every visit
+        without ``visit_ids``."""
+        if visit_ids is not None and not visit_ids:
+            return
+        self.env["crm.salesperson.planner.visit"].flush_model()
+        self.env["sale.order"].flush_model(ORDER_REPORT_FIELDS)
+        params = {
+            "all": visit_ids is None,
+            "visit_ids": list(visit_ids or []),
+            "quotation_states": QUOTATION_STATES,
+        }
+        if visit_ids is None:
+            self.env.cr.execute(
+                "TRUNCATE crm_salesperson_planner_visit_sale_report, "
+                "crm_salesperson_planner_visit_sale_report_queue"
+            )
+        else:
+            self.env.cr.execute(
+                """
+                DELETE FROM crm_salesperson_planner_visit_sale_report
+                WHERE id = ANY(%(visit_ids)s)
+                """,
+                params,
+            )
+        self.env.cr.execute(
+            "INSERT INTO crm_salesperson_planner_visit_sale_report %s %s"
+            % (self._select(), self._from()),  # pylint: disable=sql-injection
+            params,
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _enqueue(self, visit_ids):
+        """Refresh the rows of the visits at the next refresh."""
+        visit_ids = list({visit_id for visit_id in visit_ids if visit_id})
+        if visit_ids:
+            self.env.cr.execute(
+                """
+                INSERT INTO crm_salesperson_planner_visit_sale_report_queue
+                SELECT unnest(%s::int[])
+                ON CONFLICT DO NOTHING
+                """,
+                [visit_ids],
+            )
+
+    @api.model
+    def _refresh_changed(self):
+        """Refresh the rows of the visits queued since the previous call,
+        emptying the queue."""
+        self.env.cr.execute(
+            """
+            DELETE FROM crm_salesperson_planner_visit_sale_report_queue
+            RETURNING visit_id
+            """
+        )
+        self._refresh({row[0] for row in self.env.cr.fetchall()})
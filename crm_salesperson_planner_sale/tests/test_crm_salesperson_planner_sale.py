@@ -1,6 +1,8 @@
 # Copyright 2022 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
+from unittest.mock import patch
+
 from odoo.tests import Form
 
 from odoo.addons.crm_salesperson_planner.tests.test_crm_salesperson_planner_visit import (
@@ -30,3 +32,96 @@ class TestCrmSalespersonPlannerSale(TestCrmSalespersonPlannerVisitBase):
         res = self.visit1.action_view_sale_order()
         self.assertIn(order, self.env[res["res_model"]].search(res["domain"]))
         self.assertEqual(res["res_id"], order.id)
+
+    def test_visit_sale_counts(self):
+        orders = self.env["sale.order"].create(
+            [
+                {"partner_id": self.partner1.id, "visit_id": visit.id}
+                for visit in (self.visit1, self.visit1, self.visit1, self.visit2)
+            ]
+        )
+        self.assertEqual(self.visit1.quotation_count, 3)
+        self.assertEqual(self.visit2.quotation_count, 1)
+        with patch.object(
+            type(self.env["sale.order"]),
+            "read_group",
+            side_effect=AssertionError("counted with read_group"),
+        ):
+            orders[:2].write({"state": "sale"})
+            orders[2].write({"state": "cancel"})
+            orders[3].write({"visit_id": self.visit1.id})
+        self.assertEqual(self.visit1.sale_order_count, 2)
+        self.assertEqual(self.visit1.quotation_count, 1)
+        self.assertEqual(self.visit2.quotation_count, 0)
+        orders[3].unlink()
+        self.assertEqual(self.visit1.quotation_count, 0)
+        counts = (self.visit1 | self.visit2).read(
+            ["quotation_count", "sale_order_count"]
+        )
+        (self.visit1 | self.visit2)._recompute_sale_data()
+        self.assertEqual(
+            (self.visit1 | self.visit2).read(["quotation_count", "sale_order_count"]),
+            counts,
+        )
+
+    def test_visit_sale_report(self):
+        report_model = self.env["crm.salesperson.planner.visit.sale.report"]
+        orders = self.env["sale.order"].create(
+            [
+                {"partner_id": self.partner1.id, "visit_id": self.visit1.id}
+                for _index in range(2)
+            ]
+        )
+        report_model._refresh_changed()
+        row = report_model.search([("visit_id", "=", self.visit1.id)])
+        self.assertEqual(row.quotation_count, 2)
+        self.assertEqual(row.sale_order_count, 0)
+        orders[0].write({"state": "sale"})
+        orders[1].write({"visit_id": self.visit2.id})
+        report_model._refresh_changed()
+        row = report_model.search([("visit_id", "=", self.visit1.id)])
+        self.assertEqual(row.quotation_count, 0)
+        self.assertEqual(row.sale_order_count, 1)
+        self.assertEqual(row.amount_untaxed, orders[0].amount_untaxed)
+        data = report_model.read_group(
+            [("visit_id", "in", (self.visit1 | self.visit2).ids)],
+            ["visit_count", "quotation_count", "sale_order_count"],
+            ["user_id"],
+        )
+        self.assertEqual(data[0]["visit_count"], 2)
+        self.assertEqual(data[0]["quotation_count"], 1)
+        self.assertEqual(data[0]["sale_order_count"], 1)
+        self.visit1.write({"partner_id": self.partner1_contact1.id})
+        orders[0].order_line = [
+            (0, 0, {"product_id": self.env.ref("product.product_product_4").id})
+        ]
+        report_model._refresh_changed()
+        row = report_model.search([("visit_id", "=", self.visit1.id)])
+        self.assertEqual(row.partner_id, self.partner1_contact1)
+        self.assertEqual(row.amount_untaxed, orders[0].amount_untaxed)
+        orders[1].unlink()
+        self.visit2.unlink()
+        report_model._refresh_changed()
+        self.assertFalse(report_model.search([("visit_id", "=", self.visit2.id)]))
+
+    def test_visit_sale_report_queue(self):
+        report_model = self.env["crm.salesperson.planner.visit.sale.report"]
+        report_model._refresh_changed()
+        order = self.env["sale.order"].create(
+            {"partner_id": self.partner1.id, "visit_id": self.visit1.id}
+        )
+        # the form onchanges recompute the amounts, the visit is queued once
+        order_form = Form(order)
+        with order_form.order_line.new() as line_form:
+            line_form.product_id = self.env.ref("product.product_product_4")
+        order_form.save()
+        order.write({"state": "sent"})
+        self.env.cr.execute(
+            """
+            SELECT visit_id FROM crm_salesperson_planner_visit_sale_report_queue
+            """
+        )
+        self.assertEqual(self.env.cr.fetchall(), [(self.visit1.id,)])
+        report_model._refresh_changed()
+        row = report_model.search([("visit_id", "=", self.visit1.id)])
+        self.assertEqual(row.quotation_count, 1)
@@ -0,0 +1,18 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+{
+    "name": "CRM SQL Tools",
+    "summary": "Shared query helpers of the CRM addons",
+    "version": "16.0.1.0.0",
+    "development_status": "Beta",
+    "category": "Customer Relationship Management",
+    "author": "Odoo Community Association (OCA)",
+    "website": "https://github.com/OCA/crm",
+    "license": "AGPL-3",
+    "depends": ["base"],
+    "data": [
+        "security/ir.model.access.csv",
+        "views/crm_sql_relation_timing_views.xml",
+    ],
+    "installable": True,
+}
@@ -0,0 +1,7 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from . import crm_count_mixin
+from . import crm_sql_relation_timing
+from . import crm_sql_report_mixin
+from . import res_partner
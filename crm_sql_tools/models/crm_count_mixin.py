@@ -0,0 +1,25 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import api, models
+
+
+class CrmCountMixin(models.AbstractModel):
+    """Mixin of the models counted by the smart buttons of other records."""
+
+    _name = "crm.count.mixin"
+    _description = "CRM Grouped Count Mixin"
+
+    @api.model
+    def _get_count_map(self, fname, records):
+        """Count the records of this model linked by the many2one ``fname``
+        to each of ``records``, with one grouped query for the whole
+        recordset.
+
+        Return the counts by record id, unsaved records are not counted.
+        """
+        record_ids = [record_id for record_id in records._origin.ids if record_id]
+        if not record_ids:
+            return {}
+        data = self._read_group([(fname, "in", record_ids)], [fname], [fname])
+        return {item[fname][0]: item["%s_count" % fname] for item in data}
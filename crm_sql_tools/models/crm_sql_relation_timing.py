@@ -0,0 +1,26 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import fields, models
+
+
+class CrmSqlRelationTiming(models.Model):
+    """Time spent on each report view or table when its addon is installed
+    or upgraded."""
+
+    _name = "crm.sql.relation.timing"
+    _description = "CRM SQL Relation Timing"
+    _order = "id desc"
+
+    module = fields.Char(readonly=True)
+    relation = fields.Char(readonly=True)
+    kind = fields.Selection(
+        [("VIEW", "View"), ("TABLE", "Table")],
+        readonly=True,
+    )
+    created = fields.Boolean(
+        readonly=True,
+        help="Unset when the definition of the relation did not change, so "
+        "that it was not created again.",
+    )
+    duration = fields.Float(string="Duration (s)", digits=(16, 3), readonly=True)
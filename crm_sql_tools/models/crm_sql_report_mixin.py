@@ -0,0 +1,56 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+import hashlib
+import logging
+import time
+
+from psycopg2.extensions import AsIs
+
+from odoo import api, models
+
+_logger = logging.getLogger(__name__)
+
+
+class CrmSqlReportMixin(models.AbstractModel):
+    """Mixin of the reports built from SQL views or tables."""
+
+    _name = "crm.sql.report.mixin"
+    _description = "CRM SQL Report Mixin"
+
+    @api.model
+    def _init_sql_relation(self, relation, kind, sql_parts, create):
+        """Create the view or table ``relation`` by calling ``create()``,
+        unless the ``sql_parts`` defining it did not change since.
+
+        The hash of the parts is stored as the comment of the relation,
+        ``kind`` is the type of relation it is set on, ``VIEW`` or
+        ``TABLE``. The time spent is recorded by addon in
+        ``crm.sql.relation.timing``. Return whether the relation was created.
+        """
+        start = time.time()
+        sql_hash = hashlib.sha1("\n".join(sql_parts).encode()).hexdigest()
+        self.env.cr.execute(
+            "SELECT obj_description(to_regclass(%s), 'pg_class')", [relation]
+        )
+        created = self.env.cr.fetchone()[0] != sql_hash
+        if created:
+            create()
+            self.env.cr.execute(
+                "COMMENT ON %s %s IS %s", (AsIs(kind), AsIs(relation), sql_hash)
+            )
+        duration = time.time() - start
+        self.env["crm.sql.relation.timing"].sudo().create(
+            {
+                "module": self._original_module,
+                "relation": relation,
+                "kind": kind,
+                "created": created,
+                "duration": duration,
+            }
+        )
+        if created:
+            _logger.info("%s %s created in %.3fs", kind, relation, duration)
+        else:
+            _logger.info("%s %s unchanged, not created again", kind, relation)
+        return created
@@ -0,0 +1,55 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo import models
+
+
+class ResPartner(models.Model):
+    _inherit = "res.partner"
+
+    def _get_hierarchy_counts(self, model, partner_field="partner_id"):
+        """Count the records of ``model`` linked by ``partner_field`` to
+        each partner or to any of its descendants, with one query.
+
+        The descendants are searched with child_of, whose constant
+        parent_path prefixes use the index, and each of their records is
+        counted for the partners of its parent_path.
+
+        The records are the ones the current user can read. Return the counts
+        by partner id.
+        """
+        partners = self.filtered("id")
+        if not partners:
+            return {}
+        Model = self.env[model]
+        Model.check_access_rights("read")
+        Model.flush_model([partner_field])
+        self.flush_model(["parent_path"])
+        query = Model._where_calc([(partner_field, "!=", False)])
+        Model._apply_ir_rules(query, "read")
+        sql, params = query.select('"%s"."%s"' % (Model._table, partner_field))
+        child_query = (
+            self.sudo()
+            .with_context(active_test=False)
+            ._search([("id", "child_of", partners.ids)])
+        )
+        child_sql, child_params = child_query.select(
+            '"res_partner"."id"', '"res_partner"."parent_path"'
+        )
+        # pylint: disable=sql-injection
+        self.env.cr.execute(
+            """
+            SELECT ancestor.id, COUNT(*)
+            FROM ({}) child
+            JOIN ({}) record ON record.{} = child.id
+            CROSS JOIN unnest(
+                string_to_array(rtrim(child.parent_path, '/'), '/')::int[]
+            ) AS ancestor(id)
+            WHERE ancestor.id IN %s
+            GROUP BY ancestor.id
+            """.format(
+                child_sql, sql, partner_field
+            ),
+            child_params + params + [tuple(partners.ids)],
+        )
+        return dict(self.env.cr.fetchall())
@@ -0,0 +1,5 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from . import test_crm_sql_report_mixin
+from . import test_res_partner
@@ -0,0 +1,33 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo.tests import common
+
+
+class TestCrmSqlReportMixin(common.TransactionCase):
+    def test_init_sql_relation(self):
+        def create():
+            self.env.cr.execute(
+                "CREATE OR REPLACE VIEW crm_sql_tools_test AS (%s)" % query
+            )
+
+        query = "SELECT 1 AS id"
+        mixin = self.env["crm.sql.report.mixin"]
+        self.assertTrue(
+            mixin._init_sql_relation("crm_sql_tools_test", "VIEW", [query], create)
+        )
+        self.assertFalse(
+            mixin._init_sql_relation("crm_sql_tools_test", "VIEW", [query], create)
+        )
+        query = "SELECT 2 AS id"
+        self.assertTrue(
+            mixin._init_sql_relation("crm_sql_tools_test", "VIEW", [query], create)
+        )
+        self.env.cr.execute("SELECT id FROM crm_sql_tools_test")
+        self.assertEqual(self.env.cr.fetchall(), [(2,)])
+        timings = self.env["crm.sql.relation.timing"].search(
+            [("relation", "=", "crm_sql_tools_test")], order="id"
+        )
+        self.assertEqual(timings.mapped("created"), [True, False, True])
+        self.assertEqual(set(timings.mapped("module")), {"crm_sql_tools"})
+        self.assertEqual(set(timings.mapped("kind")), {"VIEW"})
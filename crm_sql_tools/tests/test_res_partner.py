@@ -0,0 +1,33 @@
+# Copyright 2026 Odoo Community Association (OCA)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
+
+from odoo.tests import common
+
+
+class TestResPartner(common.TransactionCase):
+    def test_hierarchy_counts(self):
+        company = self.env["res.partner"].create({"name": "Hierarchy Company"})
+        contact = self.env["res.partner"].create(
+            {"name": "Hierarchy Contact", "parent_id": company.id}
+        )
+        subcontact = self.env["res.partner"].create(
+            {"name": "Hierarchy Subcontact", "parent_id": contact.id, "active": False}
+        )
+        other = self.env["res.partner"].create({"name": "Hierarchy Other"})
+        # the users are the records linked to the partners
+        users = self.env["res.users"].create(
+            [
+                {"name": "Hierarchy User %s" % index, "login": "hierarchy_%s" % index}
+                for index in range(4)
+            ]
+        )
+        users[0].partner_id.parent_id = company
+        users[1].partner_id.parent_id = subcontact
+        users[2].partner_id = subcontact
+        partners = company | contact | subcontact | other
+        counts = partners._get_hierarchy_counts("res.users")
+        self.assertEqual(counts, {company.id: 3, contact.id: 2, subcontact.id: 2})
+        self.assertEqual(
+            (contact | other)._get_hierarchy_counts("res.users"), {contact.id: 2}
+        )
+        self.assertEqual(self.env["res.partner"]._get_hierarchy_counts("res.users"), {})
@@ -9,7 +9,7 @@
     "website": "https://github.com/OCA/crm",
     "author": "Camptocamp, Odoo Community Association (OCA), Odoo SA",
     "license": "AGPL-3",
-    "depends": ["crm"],
+    "depends": ["crm", "crm_sql_tools"],
     "data": [
         "views/crm_lead.xml",
         "views/crm_stage.xml",
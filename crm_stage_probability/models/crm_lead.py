@@ -5,7 +5,8 @@ from odoo import api, fields, models, tools
 
 class CrmLead(models.Model):
 
-    _inherit = "crm.lead"
+    _name = "crm.lead"
+    _inherit = ["crm.lead", "crm.count.mixin"]
 
     is_stage_probability = fields.Boolean(
         compute="_compute_is_stage_probability", readonly=True
@@ -93,6 +93,21 @@ class TestCrmLeadProbability(TransactionCase):
         )
         self.assertEqual(won_line.lead_count, 3)
 
+    def test_mass_update_lead_count_queries(self):
+        all_stages = self.env["crm.stage"].search([])
+        lines = (
+            self.env["crm.lead.stage.probability.update"]
+            .with_context(active_ids=all_stages.ids)
+            .create({})
+            .crm_stage_update_ids
+        )
+        lines.mapped("lead_count")
+        # one grouped query, whatever the number of lines
+        for records in (lines[:1], lines):
+            records.invalidate_recordset(["lead_count"])
+            with self.assertQueryCount(2):
+                records.mapped("lead_count")
+
     def test_mass_update_no_onchange_stage(self):
         new_stage = self.env["crm.stage"].create(
             {
@@ -78,7 +78,6 @@ class CrmLeadStageProbabilityUpdateStage(models.TransientModel):
 
     @api.depends("stage_id")
     def _compute_lead_count(self):
+        counts = self.env["crm.lead"]._get_count_map("stage_id", self.stage_id)
         for stage_line in self:
-            stage_line.lead_count = self.env["crm.lead"].search_count(
-                [("stage_id", "=", stage_line.stage_id.id)]
-            )
+            stage_line.lead_count = counts.get(stage_line.stage_id.id, 0)
@@ -20,32 +20,111 @@
 #
 #############################################################################
 
-from odoo import models, fields, api
+import psycopg2
+
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import AccessError
+
+
+def _uncached(method):
+    """
+    Return the function behind an ormcache'd method, so that an override can
+    cache the result under its own key.
+    """
+    return getattr(method, '__wrapped__', method)
 
 
 class HideMenuUser(models.Model):
     _inherit = 'res.users'
 
-    @api.model
-    def create(self, vals):
+    def init(self):
         """
-        Else the menu will be still hidden even after removing from the list
+        The hidden menu versions are taken from a sequence, a version number is
+        never given twice even when the transaction bumping it is rolled back.
         """
-        self.clear_caches()
-        return super(HideMenuUser, self).create(vals)
+        super(HideMenuUser, self).init()
+        self.env.cr.execute(
+            "CREATE SEQUENCE IF NOT EXISTS res_users_hide_menu_version_seq")
 
     def write(self, vals):
         """
-        Else the menu will be still hidden even after removing from the list
+        Only the users whose hidden menus changed get a new menu cache version,
+        the caches of the other users and of the registry are kept.
+        hide_menu_ids and ir.ui.menu restrict_user_ids share the same relation
+        table, so there is nothing to write back on the menus.
         """
         res = super(HideMenuUser, self).write(vals)
-        for menu in self.hide_menu_ids:
-            menu.write({
-                'restrict_user_ids': [(4, self.id)]
-            })
-        self.clear_caches()
+        if 'hide_menu_ids' in vals:
+            self._invalidate_hide_menu_cache()
         return res
 
+    def hide_menus(self, menu_ids):
+        """
+        Hide the given menus to all the users at once.
+        """
+        self._set_hidden_menus(menu_ids, hide=True)
+
+    def unhide_menus(self, menu_ids):
+        """
+        Show again the given menus to all the users at once.
+        """
+        self._set_hidden_menus(menu_ids, hide=False)
+
+    def _set_hidden_menus(self, menu_ids, hide=True):
+        """
+        Insert into or delete from the hidden menu relation with one query for
+        the whole users x menus set, then invalidate the caches once for the
+        users that actually changed. The admin user is left untouched, as in
+        the user form.
+        """
+        if not self.env.is_admin():
+            raise AccessError(_("Only administrators can hide menus."))
+        users = self - self.env.ref('base.user_admin')
+        if not users or not menu_ids:
+            return
+        field = self._fields['hide_menu_ids']
+        if hide:
+            query = """
+                INSERT INTO {rel} ({user_col}, {menu_col})
+                     SELECT u.id, m.id
+                       FROM res_users u, ir_ui_menu m
+                      WHERE u.id = ANY(%s) AND m.id = ANY(%s)
+                ON CONFLICT DO NOTHING
+                  RETURNING {user_col}
+            """
+        else:
+            query = """
+                DELETE FROM {rel}
+                      WHERE {user_col} = ANY(%s) AND {menu_col} = ANY(%s)
+                  RETURNING {user_col}
+            """
+        self.env.cr.execute(
+            query.format(rel=field.relation, user_col=field.column1,
+                         menu_col=field.column2),
+            [list(users.ids), list(menu_ids)])
+        changed = self.browse({row[0] for row in self.env.cr.fetchall()})
+        if changed:
+            self.invalidate_model(['hide_menu_ids'])
+            self.env['ir.ui.menu'].invalidate_model(['restrict_user_ids'])
+            changed._invalidate_hide_menu_cache()
+
+    def _invalidate_hide_menu_cache(self):
+        """
+        Give the users a new hidden menu version. The visible menus cached
+        under the previous version are not used anymore, in every worker.
+        """
+        if not self.ids:
+            return
+        self.env.cr.execute("""
+            UPDATE res_users
+               SET hide_menu_version = nextval('res_users_hide_menu_version_seq')
+             WHERE id IN %s
+        """, [tuple(self.ids)])
+        self.env.cr.execute(
+            "DELETE FROM ir_ui_menu_user_visible WHERE user_id IN %s",
+            [tuple(self.ids)])
+        self.invalidate_recordset(['hide_menu_version'])
+
     def _get_is_admin(self):
         """
         The Hide specific menu tab will be hidden for the Admin user form.
@@ -59,6 +138,9 @@ class HideMenuUser(models.Model):
     hide_menu_ids = fields.Many2many('ir.ui.menu', string="Menu", store=True,
                                      help='Select menu items that needs to be '
                                           'hidden to this user ')
+    hide_menu_version = fields.Integer(readonly=True, copy=False,
+                                       help='Changes each time the hidden '
+                                            'menus of the user change')
     is_admin = fields.Boolean(compute=_get_is_admin)
 
 
@@ -66,3 +148,126 @@ class RestrictMenu(models.Model):
     _inherit = 'ir.ui.menu'
 
     restrict_user_ids = fields.Many2many('res.users')
+    restrict_group_ids = fields.Many2many(
+        'res.groups', 'ir_ui_menu_restrict_group_rel', 'menu_id', 'group_id',
+        string='Restrict Groups',
+        help='The menu is hidden to every user of these groups')
+
+    def write(self, vals):
+        """
+        The users added to or removed from the menus get a new hidden menu
+        version.
+        """
+        if 'restrict_user_ids' not in vals:
+            return super(RestrictMenu, self).write(vals)
+        users = self.restrict_user_ids
+        res = super(RestrictMenu, self).write(vals)
+        (users | self.restrict_user_ids)._invalidate_hide_menu_cache()
+        return res
+
+    def init(self):
+        """
+        The menus visible to each user are stored, so that a worker with an
+        empty cache serves them with one lookup on the primary key instead of
+        a search filtered by the restrict_menu_user rule.
+        """
+        super(RestrictMenu, self).init()
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS ir_ui_menu_user_visible (
+                user_id INTEGER NOT NULL
+                    REFERENCES res_users(id) ON DELETE CASCADE,
+                debug BOOLEAN NOT NULL,
+                stamp VARCHAR NOT NULL,
+                menu_ids INTEGER[] NOT NULL,
+                PRIMARY KEY (user_id, debug)
+            )
+        """)
+
+    @api.model
+    def _visible_menu_stamp(self):
+        """
+        Return the stamp under which the visible menus of the user are
+        stored, or None when they must not be stored. The stamp changes when
+        the hidden menus of the user change, and with the cache sequence of
+        the registry, that is each time the menus, the groups or the access
+        rights change in any worker. Nothing is stored when the caches were
+        cleared by the current transaction, as the other workers are not
+        signaled yet.
+        """
+        registry = self.env.registry
+        if registry.cache_sequence is None or registry.cache_invalidated:
+            return None
+        return '%s-%s' % (registry.cache_sequence,
+                          self.env.user.hide_menu_version or 0)
+
+    @api.model
+    @tools.ormcache('frozenset(self.env.user.groups_id.ids)', 'self.env.uid',
+                    'self.env.user.hide_menu_version', 'debug')
+    def _visible_menu_ids(self, debug=False):
+        """
+        The restrict_menu_user rule makes the visible menus depend on the
+        user and not only on the groups, they are cached per user and per
+        hidden menu version, and stored for the other workers.
+        """
+        stamp = self._visible_menu_stamp()
+        cr = self.env.cr
+        if stamp:
+            cr.execute("""
+                SELECT menu_ids FROM ir_ui_menu_user_visible
+                 WHERE user_id = %s AND debug = %s AND stamp = %s
+            """, [self.env.uid, bool(debug), stamp])
+            row = cr.fetchone()
+            if row:
+                return set(row[0])
+        menus = self.sudo(False)
+        visible = _uncached(super(RestrictMenu, menus)._visible_menu_ids)(
+            menus, debug)
+        if stamp:
+            try:
+                with tools.mute_logger('odoo.sql_db'), \
+                        cr.savepoint(flush=False):
+                    cr.execute("""
+                        INSERT INTO ir_ui_menu_user_visible
+                                    (user_id, debug, stamp, menu_ids)
+                             VALUES (%s, %s, %s, %s)
+                        ON CONFLICT (user_id, debug) DO UPDATE
+                                SET stamp = EXCLUDED.stamp,
+                                    menu_ids = EXCLUDED.menu_ids
+                    """, [self.env.uid, bool(debug), stamp, list(visible)])
+            except psycopg2.Error:
+                # another worker is storing the same menus, keep its version
+                pass
+        return visible
+
+    @api.model
+    @tools.ormcache_context('self._uid', 'self.env.user.hide_menu_version',
+                            keys=('lang',))
+    def load_menus_root(self):
+        """
+        The hidden menus are already left out by the visible menus of the
+        user, the menus are searched without applying the record rules again.
+        """
+        return _uncached(super(RestrictMenu, self).load_menus_root)(
+            self.sudo())
+
+    @api.model
+    @tools.ormcache_context('self._uid', 'self.env.user.hide_menu_version',
+                            'debug', keys=('lang',))
+    def load_menus(self, debug):
+        """
+        The hidden menus are already left out by the visible menus of the
+        user, the menus are searched without applying the record rules again.
+        """
+        return _uncached(super(RestrictMenu, self).load_menus)(
+            self.sudo(), debug)
+
+
+class HideMenuGroup(models.Model):
+    _inherit = 'res.groups'
+
+    hide_menu_ids = fields.Many2many(
+        'ir.ui.menu', 'ir_ui_menu_restrict_group_rel', 'group_id', 'menu_id',
+        string='Menu',
+        help='Select menu items that needs to be hidden to the users of this '
+             'group. One row per group and menu is enough to hide it to '
+             'all of them.')
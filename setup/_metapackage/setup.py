@@ -23,8 +23,10 @@ setuptools.setup(
         'odoo-addon-crm_phonecall>=16.0dev,<16.1dev',
         'odoo-addon-crm_project_task>=16.0dev,<16.1dev',
         'odoo-addon-crm_salesperson_planner>=16.0dev,<16.1dev',
+        'odoo-addon-crm_salesperson_planner_route>=16.0dev,<16.1dev',
         'odoo-addon-crm_salesperson_planner_sale>=16.0dev,<16.1dev',
         'odoo-addon-crm_security_group>=16.0dev,<16.1dev',
+        'odoo-addon-crm_sql_tools>=16.0dev,<16.1dev',
         'odoo-addon-crm_stage_probability>=16.0dev,<16.1dev',
     ],
     classifiers=[
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2021-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from unittest.mock import PropertyMock, patch
+
+from odoo.modules.registry import Registry
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+# The size of the benchmark and the file receiving the JSON report can be
+# given through the environment, e.g.
+# HIDE_MENU_BENCH_USERS=5000 HIDE_MENU_BENCH_MENUS=300
+# HIDE_MENU_BENCH_OUTPUT=/tmp/hide_menu_user.json
+# odoo-bin -i hide_menu_user --test-tags hide_menu_benchmark --stop-after-init
+BENCH_USERS = int(os.environ.get('HIDE_MENU_BENCH_USERS', 5000))
+BENCH_MENUS = int(os.environ.get('HIDE_MENU_BENCH_MENUS', 300))
+BENCH_SAMPLE = int(os.environ.get('HIDE_MENU_BENCH_SAMPLE', 50))
+BENCH_OUTPUT = os.environ.get('HIDE_MENU_BENCH_OUTPUT')
+
+
+@tagged('post_install', '-at_install', '-standard', 'hide_menu_benchmark')
+class TestHideMenuBenchmark(TransactionCase):
+    """
+    Seed BENCH_USERS users with BENCH_MENUS hidden menus each, and measure
+    the menu loading and the user writes. The results are logged and
+    written as JSON, to be compared between two versions of the module.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = {
+            'users': BENCH_USERS,
+            'menus': BENCH_MENUS,
+            'benchmarks': {},
+        }
+        start = time.perf_counter()
+        action = cls.env['ir.actions.act_window'].create({
+            'name': 'Hide Menu Benchmark',
+            'res_model': 'res.partner',
+        })
+        root = cls.env['ir.ui.menu'].create({'name': 'Hide Menu Benchmark'})
+        cls.menus = cls.env['ir.ui.menu'].create([{
+            'name': 'Hide Menu Benchmark %s' % index,
+            'parent_id': root.id,
+            'action': 'ir.actions.act_window,%d' % action.id,
+        } for index in range(BENCH_MENUS)])
+        group_user = cls.env.ref('base.group_user')
+        Users = cls.env['res.users'].with_context(
+            no_reset_password=True, tracking_disable=True)
+        cls.users = Users.browse()
+        for offset in range(0, BENCH_USERS, 500):
+            cls.users |= Users.create([{
+                'name': 'Hide Menu Benchmark %s' % index,
+                'login': 'hide_menu_benchmark_%s' % index,
+                'groups_id': [(6, 0, group_user.ids)],
+            } for index in range(offset, min(offset + 500, BENCH_USERS))])
+        cls.users.hide_menus(cls.menus.ids)
+        cls.sample = cls.users[:BENCH_SAMPLE]
+        cls.results['seed_seconds'] = round(time.perf_counter() - start, 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        report = json.dumps(cls.results, indent=2, sort_keys=True)
+        _logger.info('hide_menu_user benchmark:\n%s', report)
+        if BENCH_OUTPUT:
+            with open(BENCH_OUTPUT, 'w') as output:
+                output.write(report)
+        super().tearDownClass()
+
+    @contextmanager
+    def _measure(self, name, operations):
+        """
+        Record the duration, the queries and the cache invalidations of the
+        block under the given name. The block appends one duration per
+        operation to the yielded list.
+        """
+        counters = {'registry_cache_clears': 0, 'user_cache_invalidations': 0}
+        clear_cache = Registry._clear_cache
+        Users = type(self.env['res.users'])
+        invalidate = Users._invalidate_hide_menu_cache
+
+        def count_clear_cache(registry):
+            counters['registry_cache_clears'] += 1
+            return clear_cache(registry)
+
+        def count_invalidate(users):
+            counters['user_cache_invalidations'] += len(users)
+            return invalidate(users)
+
+        timings = []
+        queries = self.env.cr.sql_log_count
+        with patch.object(Registry, '_clear_cache', count_clear_cache), \
+                patch.object(Users, '_invalidate_hide_menu_cache',
+                             count_invalidate):
+            yield timings
+        timings.sort()
+        total = sum(timings)
+        self.results['benchmarks'][name] = dict(
+            counters,
+            operations=operations,
+            queries=self.env.cr.sql_log_count - queries,
+            total_seconds=round(total, 6),
+            per_second=round(operations / total, 3) if total else None,
+            median_ms=round(timings[len(timings) // 2] * 1000, 3),
+            p95_ms=round(timings[int(len(timings) * 0.95)] * 1000, 3),
+            max_ms=round(timings[-1] * 1000, 3),
+        )
+
+    @staticmethod
+    def _timed(timings, function, *args):
+        start = time.perf_counter()
+        res = function(*args)
+        timings.append(time.perf_counter() - start)
+        return res
+
+    def _load_menus(self, user):
+        return self.env['ir.ui.menu'].with_user(user).load_menus(False)
+
+    def test_load_menus(self):
+        with self._measure('load_menus_cold', len(self.sample)) as timings:
+            for user in self.sample:
+                menus = self._timed(timings, self._load_menus, user)
+        self.assertNotIn(self.menus[0].id, menus)
+        with self._measure('load_menus_warm', len(self.sample)) as timings:
+            for user in self.sample:
+                self._timed(timings, self._load_menus, user)
+
+    def test_load_menus_stored(self):
+        """
+        Cold caches served by the stored visible menus, as a worker sees
+        them after a restart or after another worker cleared the caches.
+        """
+        with patch.object(self.env.registry, 'cache_sequence', 1), \
+                patch.object(Registry, 'cache_invalidated',
+                             new_callable=PropertyMock, return_value=False):
+            for user in self.sample:
+                self._load_menus(user)
+            self.env.registry._clear_cache()
+            with self._measure('load_menus_stored',
+                               len(self.sample)) as timings:
+                for user in self.sample:
+                    self._timed(timings, self._load_menus, user)
+
+    def test_user_write(self):
+        with self._measure('user_write', len(self.users)) as timings:
+            for user in self.users:
+                self._timed(timings, user.write,
+                            {'email': '%s@example.com' % user.login})
+        benchmark = self.results['benchmarks']['user_write']
+        self.assertEqual(benchmark['registry_cache_clears'], 0)
+        self.assertEqual(benchmark['user_cache_invalidations'], 0)
+
+    def test_hide_menu_write(self):
+        menu = self.menus[0]
+        with self._measure('hide_menu_write', len(self.sample)) as timings:
+            for user in self.sample:
+                self._timed(timings, user.write,
+                            {'hide_menu_ids': [(3, menu.id)]})
+        benchmark = self.results['benchmarks']['hide_menu_write']
+        self.assertEqual(benchmark['registry_cache_clears'], 0)
+        self.assertEqual(benchmark['user_cache_invalidations'],
+                         len(self.sample))
+
+    def test_bulk_hide_menus(self):
+        menus = self.menus[:10]
+        with self._measure('bulk_unhide_menus', 1) as timings:
+            self._timed(timings, self.users.unhide_menus, menus.ids)
+        with self._measure('bulk_hide_menus', 1) as timings:
+            self._timed(timings, self.users.hide_menus, menus.ids)
+        benchmark = self.results['benchmarks']['bulk_hide_menus']
+        self.assertEqual(benchmark['registry_cache_clears'], 0)
+        self.assertEqual(benchmark['user_cache_invalidations'],
+                         len(self.users))
+
+    def test_load_menus_during_user_sync(self):
+        """
+        A nightly user synchronisation writes every user one by one while
+        a user keeps loading the menus.
+        """
+        user = self.sample[0]
+        self._load_menus(user)
+        with self._measure('load_menus_during_user_sync',
+                           len(self.users)) as timings:
+            for synced_user in self.users:
+                synced_user.write({'name': synced_user.name + ' (synced)'})
+                self._timed(timings, self._load_menus, user)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2021-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+
+from odoo.exceptions import AccessError
+from odoo.tests import tagged
+
+from .test_hide_menu_cache import HideMenuCommon
+
+
+@tagged('post_install', '-at_install')
+class TestHideMenuBulk(HideMenuCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = cls.env['res.users'].create([{
+            'name': 'Hide Menu Bulk %s' % index,
+            'login': 'hide_menu_bulk_%s' % index,
+            'groups_id': [(6, 0, cls.group_user.ids)],
+        } for index in range(20)])
+
+    def test_hide_unhide_menus(self):
+        self.users.hide_menus(self.menu.ids)
+        self.assertEqual(self.menu.restrict_user_ids, self.users)
+        for user in self.users[:3]:
+            self.assertEqual(user.hide_menu_ids, self.menu)
+            self.assertNotIn(self.menu.id, self._visible_menu_ids(user))
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.user))
+        # hiding twice does not fail nor bump the versions again
+        versions = self.users.mapped('hide_menu_version')
+        self.users.hide_menus(self.menu.ids)
+        self.assertEqual(self.users.mapped('hide_menu_version'), versions)
+        self.users[:10].unhide_menus(self.menu.ids)
+        self.assertEqual(self.menu.restrict_user_ids, self.users[10:])
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.users[0]))
+        self.assertNotIn(self.menu.id, self._visible_menu_ids(self.users[10]))
+
+    def test_hide_menus_admin_untouched(self):
+        admin = self.env.ref('base.user_admin')
+        (self.users | admin).hide_menus(self.menu.ids)
+        self.assertNotIn(admin, self.menu.restrict_user_ids)
+
+    def test_hide_menus_access(self):
+        with self.assertRaises(AccessError):
+            self.users.with_user(self.user).hide_menus(self.menu.ids)
+
+    def test_hide_menu_wizard(self):
+        wizard = self.env['hide.menu.wizard'].with_context(
+            active_model='res.users', active_ids=self.users.ids,
+        ).create({'menu_ids': [(6, 0, self.menu.ids)]})
+        self.assertEqual(wizard.user_ids, self.users)
+        wizard.action_apply()
+        self.assertEqual(self.menu.restrict_user_ids, self.users)
+        wizard.action = 'unhide'
+        wizard.action_apply()
+        self.assertFalse(self.menu.restrict_user_ids)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2021-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+
+from unittest.mock import PropertyMock, patch
+
+from odoo.modules.registry import Registry
+from odoo.tests import TransactionCase, tagged
+
+from ..models.res_user import _uncached
+
+
+class HideMenuCommon(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        action = cls.env['ir.actions.act_window'].create({
+            'name': 'Hide Menu Partners',
+            'res_model': 'res.partner',
+        })
+        cls.menu = cls.env['ir.ui.menu'].create({
+            'name': 'Hide Menu Test',
+            'action': 'ir.actions.act_window,%d' % action.id,
+        })
+        cls.group_user = cls.env.ref('base.group_user')
+        cls.user = cls._create_user('hide_menu_user')
+        cls.other_user = cls._create_user('hide_menu_other_user')
+
+    @classmethod
+    def _create_user(cls, login):
+        return cls.env['res.users'].create({
+            'name': login,
+            'login': login,
+            'groups_id': [(6, 0, cls.group_user.ids)],
+        })
+
+    def _visible_menu_ids(self, user):
+        return self.env['ir.ui.menu'].with_user(user)._visible_menu_ids()
+
+
+@tagged('post_install', '-at_install')
+class TestHideMenuCache(HideMenuCommon):
+
+    def test_hide_menu_user(self):
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.user))
+        self.user.write({'hide_menu_ids': [(4, self.menu.id)]})
+        self.assertIn(self.user, self.menu.restrict_user_ids)
+        self.assertNotIn(self.menu.id, self._visible_menu_ids(self.user))
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.other_user))
+        self.user.write({'hide_menu_ids': [(3, self.menu.id)]})
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.user))
+
+    def test_restrict_menu_users(self):
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.other_user))
+        version = self.user.hide_menu_version
+        self.menu.write({'restrict_user_ids': [(4, self.other_user.id)]})
+        self.assertNotIn(self.menu.id, self._visible_menu_ids(self.other_user))
+        self.assertEqual(self.user.hide_menu_version, version)
+
+    def test_unrelated_write_keeps_caches(self):
+        version = self.user.hide_menu_version
+        with patch.object(Registry, '_clear_cache') as clear_cache:
+            self.user.write({'name': 'Renamed Hide Menu User'})
+        clear_cache.assert_not_called()
+        self.assertEqual(self.user.hide_menu_version, version)
+
+    def test_hide_menu_keeps_registry_cache(self):
+        with patch.object(Registry, '_clear_cache') as clear_cache:
+            self.user.write({'hide_menu_ids': [(4, self.menu.id)]})
+        clear_cache.assert_not_called()
+        self.assertNotIn(self.menu.id, self._visible_menu_ids(self.user))
+
+    def test_stored_visible_menus(self):
+        menus = self.env['ir.ui.menu'].with_user(self.user)
+        visible_menu_ids = _uncached(menus._visible_menu_ids)
+        self.env.cr.execute(
+            "SELECT menu_ids FROM ir_ui_menu_user_visible WHERE user_id = %s",
+            [self.user.id])
+        self.assertFalse(self.env.cr.fetchall())
+        with patch.object(self.env.registry, 'cache_sequence', 1), \
+                patch.object(Registry, 'cache_invalidated',
+                             new_callable=PropertyMock, return_value=False):
+            visible = visible_menu_ids(menus)
+            self.assertIn(self.menu.id, visible)
+            self.env.cr.execute("""
+                SELECT menu_ids FROM ir_ui_menu_user_visible
+                 WHERE user_id = %s AND NOT debug
+            """, [self.user.id])
+            self.assertEqual(set(self.env.cr.fetchone()[0]), visible)
+            # the stored menus are served as they are
+            self.env.cr.execute("""
+                UPDATE ir_ui_menu_user_visible SET menu_ids = %s
+                 WHERE user_id = %s
+            """, [[self.menu.id], self.user.id])
+            self.assertEqual(visible_menu_ids(menus), {self.menu.id})
+            # until the hidden menus of the user change
+            self.user.write({'hide_menu_ids': [(4, self.menu.id)]})
+            visible = visible_menu_ids(menus)
+            self.assertTrue(visible)
+            self.assertNotIn(self.menu.id, visible)
+
+    def test_load_menus(self):
+        self.user.write({'hide_menu_ids': [(4, self.menu.id)]})
+        menus = self.env['ir.ui.menu'].with_user(self.user).load_menus(False)
+        self.assertNotIn(self.menu.id, menus)
+        menus = self.env['ir.ui.menu'].with_user(
+            self.other_user).load_menus(False)
+        self.assertIn(self.menu.id, menus)
+        self.assertIn(self.menu.id, menus['root']['children'])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2021-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+
+from odoo.tests import tagged
+
+from .test_hide_menu_cache import HideMenuCommon
+
+
+@tagged('post_install', '-at_install')
+class TestHideMenuGroup(HideMenuCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        action = cls.env['ir.actions.act_window'].create({
+            'name': 'Hide Menu Users',
+            'res_model': 'res.partner',
+        })
+        cls.menu2 = cls.env['ir.ui.menu'].create({
+            'name': 'Hide Menu Test 2',
+            'action': 'ir.actions.act_window,%d' % action.id,
+        })
+        cls.group_1 = cls.env['res.groups'].create({'name': 'Hide Menu 1'})
+        cls.group_2 = cls.env['res.groups'].create({'name': 'Hide Menu 2'})
+        cls.user.groups_id = [(4, cls.group_1.id)]
+        cls.other_user.groups_id = [(4, cls.group_2.id)]
+        cls.both_user = cls._create_user('hide_menu_both_user')
+        cls.both_user.groups_id = [(4, cls.group_1.id), (4, cls.group_2.id)]
+        cls.menus = cls.menu | cls.menu2
+        cls.users = cls.user | cls.other_user | cls.both_user
+
+    def _visible_matrix(self):
+        return {
+            user: self.menus.filtered(
+                lambda menu: menu.id in self._visible_menu_ids(user))
+            for user in self.users
+        }
+
+    def _reset(self):
+        self.menus.write({
+            'restrict_user_ids': [(5, 0, 0)],
+            'restrict_group_ids': [(5, 0, 0)],
+        })
+
+    def test_group_mode_matches_user_mode(self):
+        cases = [
+            {},
+            {self.menu: self.group_1},
+            {self.menu: self.group_2},
+            {self.menu: self.group_1 | self.group_2},
+            {self.menu: self.group_1, self.menu2: self.group_2},
+            {self.menu: self.group_2, self.menu2: self.group_1 | self.group_2},
+        ]
+        for case in cases:
+            with self.subTest(case=case):
+                self._reset()
+                for menu, groups in case.items():
+                    menu.restrict_group_ids = groups
+                group_mode = self._visible_matrix()
+                self._reset()
+                for menu, groups in case.items():
+                    menu.restrict_user_ids = self.users & groups.users
+                user_mode = self._visible_matrix()
+                self.assertEqual(group_mode, user_mode)
+
+    def test_hide_menu_group(self):
+        self.group_1.hide_menu_ids = self.menu
+        self.assertEqual(self.menu.restrict_group_ids, self.group_1)
+        self.assertNotIn(self.menu.id, self._visible_menu_ids(self.user))
+        self.assertNotIn(self.menu.id, self._visible_menu_ids(self.both_user))
+        self.assertIn(self.menu.id, self._visible_menu_ids(self.other_user))
+        self.assertFalse(self.menu.restrict_user_ids)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2021-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+
+from odoo import models, fields, api
+
+
+class HideMenuWizard(models.TransientModel):
+    _name = 'hide.menu.wizard'
+    _description = 'Hide Menus For Several Users'
+
+    @api.model
+    def default_get(self, fields_list):
+        """
+        The users selected in the list view are taken by default.
+        """
+        res = super(HideMenuWizard, self).default_get(fields_list)
+        if (self.env.context.get('active_model') == 'res.users'
+                and 'user_ids' in fields_list):
+            res['user_ids'] = [(6, 0, self.env.context.get('active_ids', []))]
+        return res
+
+    action = fields.Selection([('hide', 'Hide'), ('unhide', 'Unhide')],
+                              default='hide', required=True)
+    user_ids = fields.Many2many('res.users', 'hide_menu_wizard_user_rel',
+                                string='Users', required=True)
+    menu_ids = fields.Many2many('ir.ui.menu', 'hide_menu_wizard_menu_rel',
+                                string='Menus', required=True)
+
+    def action_apply(self):
+        """
+        Hide or show the menus to all the selected users in one go.
+        """
+        self.ensure_one()
+        if self.action == 'hide':
+            self.user_ids.hide_menus(self.menu_ids.ids)
+        else:
+            self.user_ids.unhide_menus(self.menu_ids.ids)
+        return {'type': 'ir.actions.act_window_close'}